@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+
+
+USER_CACHE_TTL = 60
+# Everything but the credentials; the rest of a cached user is loaded lazily if ever read.
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname not in ('password', 'last_login')
+)
+
+
+def user_cache_key(user_id):
+    return f'accounts:auth-user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that builds `request.user` from a short-lived cached
+    row instead of querying the user on every request.
+
+    The row is dropped whenever the user is saved or deleted (see
+    accounts.signals), so deactivation and admin changes apply immediately.
+    With CHECK_REVOKE_TOKEN enabled the password hash is needed and the
+    lookup falls back to the database.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            values = (
+                User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(*CACHED_FIELDS).first()
+            )
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, values, timeout=USER_CACHE_TTL)
+
+        user = User.from_db('default', CACHED_FIELDS, values)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from .models import UserProfile
+from .serializers import ProfileCardSerializer
+
+
+# Signals drop a card only in the cache they can reach; with a per-process default
+# cache (LocMemCache) this TTL bounds how stale cards changed by other processes get.
+CARD_TTL = 60
+# Most cards accepted by one batch request.
+MAX_BATCH = 100
+
+
+def card_cache_key(user_id):
+    return f'accounts:profile-card:{user_id}'
+
+
+def invalidate_card(user_id):
+    cache.delete(card_cache_key(user_id))
+
+
+def get_cards(user_ids, request):
+    """
+    Rendered profile cards by user id. Cached cards are read in one cache
+    round trip; the rest are loaded in two queries (profiles joined with
+    users, then social links) and cached per user and origin.
+    """
+    origin = f'{request.scheme}://{request.get_host()}'
+    keys = {user_id: card_cache_key(user_id) for user_id in user_ids}
+    cached = cache.get_many(keys.values())
+
+    cards, stored = {}, {}
+    for user_id, key in keys.items():
+        by_origin = cached.get(key) or {}
+        if origin in by_origin:
+            cards[user_id] = by_origin[origin]
+        else:
+            stored[user_id] = by_origin
+
+    if stored:
+        profiles = list(
+            UserProfile.objects.filter(user_id__in=stored, user__is_active=True)
+            .select_related('user').prefetch_related('user__social_links')
+        )
+        fresh = {}
+        for profile, card in zip(profiles, ProfileCardSerializer(profiles, many=True, context={'request': request}).data):
+            cards[profile.user_id] = card
+            fresh[keys[profile.user_id]] = {**stored[profile.user_id], origin: card}
+        cache.set_many(fresh, timeout=CARD_TTL)
+    return cards
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from accounts.otp import get_otp_backend, RETENTION
+
+
+class Command(BaseCommand):
+    help = f'Delete one-time codes older than {RETENTION} from the configured OTP backend.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = get_otp_backend().purge(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{total} codes purged'))
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from accounts.sms import deliver_batch, delivery_stats, get_sms_provider
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued SMS messages in batches, retrying failures with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Drain the due messages once and exit.')
+        parser.add_argument('--stats', action='store_true', help='Print delivery metrics of the last hour and exit.')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            for name, value in delivery_stats().items():
+                self.stdout.write(f'{name}: {value if value is not None else "-"}')
+            return
+
+        provider = get_sms_provider()
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = deliver_batch(provider, batch_size=options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'{total_sent} sent, {total_failed} failed'))
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:01
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('phone', models.CharField(max_length=11, unique=True, verbose_name='phone number')),
+                ('email', models.EmailField(max_length=255, unique=True, verbose_name='Email address')),
+                ('username', models.CharField(max_length=255, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_admin', models.BooleanField(default=False)),
+                ('followers_count', models.PositiveIntegerField(db_index=True, default=0, editable=False)),
+                ('following_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('subscribers_count', models.PositiveIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OTPCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', models.CharField(max_length=11, verbose_name='Phone Number')),
+                ('code', models.CharField(max_length=6)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['phone', '-created_at'], name='otp_phone_created_idx'), models.Index(fields=['created_at'], name='otp_created_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SMSMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', models.CharField(max_length=11, verbose_name='Phone Number')),
+                ('body', models.TextField()),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('sending', 'sending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='sms_outbox_due_idx'), models.Index(fields=['status', 'created_at'], name='sms_outbox_status_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SocialLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=55)),
+                ('link', models.URLField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='social_links', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=55, null=True, verbose_name='First Name')),
+                ('surname', models.CharField(blank=True, max_length=55, null=True, verbose_name='Last Name')),
+                ('picture', models.ImageField(blank=True, null=True, upload_to='accounts/', verbose_name='Profile Picture')),
+                ('picture_variants', models.JSONField(blank=True, default=dict, editable=False)),
+                ('bio', models.TextField(blank=True, null=True, verbose_name='Biography')),
+                ('birth_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('gender', models.CharField(blank=True, choices=[('male', 'male'), ('female', 'female'), ('other', 'other')], null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'id'], name='profile_created_idx')],
+            },
+        ),
+    ]
@@ -5,12 +5,19 @@ from django.utils import timezone
 from datetime import timedelta
 
 
+OTP_TTL = timedelta(minutes=3)
+COUNTER_FIELDS = ('followers_count', 'following_count', 'subscribers_count')
+
+
 class User(AbstractBaseUser):
     phone = models.CharField(verbose_name='phone number', unique=True, max_length=11)
     email = models.EmailField(verbose_name='Email address', unique=True, max_length=255)
     username = models.CharField(unique=True, max_length=255)
     is_active = models.BooleanField(default=True)
     is_admin = models.BooleanField(default=False)
+    followers_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    subscribers_count = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager() 
 
@@ -19,6 +26,17 @@ class User(AbstractBaseUser):
 
     def __str__(self):
         return self.username
+
+    def save(self, *args, **kwargs):
+        # The counters only move through F() updates in relationships.signals;
+        # never write back the copy this instance happened to load.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
     
     def has_perm(self, perm, obj=None):
         return True
@@ -45,14 +63,21 @@ class UserProfile(models.Model):
     name = models.CharField(verbose_name='First Name', max_length=55, null=True, blank=True)
     surname = models.CharField(verbose_name='Last Name', max_length=55, null=True, blank=True)
     picture = models.ImageField(verbose_name='Profile Picture', upload_to='accounts/', null=True, blank=True)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(verbose_name='Biography', null=True, blank=True)
     birth_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     gender = models.CharField(choices=[
         ('male','male'),
         ('female','female'),
         ('other','other')],
         null= True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='profile_created_idx'),
+        ]
     
     @property
     def get_social_links(self):
@@ -65,11 +90,47 @@ class UserProfile(models.Model):
 class OTPCode(models.Model):
     phone = models.CharField(verbose_name='Phone Number', max_length=11)
     code = models.CharField(max_length=6)
+    attempts = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['phone', '-created_at'], name='otp_phone_created_idx'),
+            models.Index(fields=['created_at'], name='otp_created_idx'),
+        ]
+
     def __str__(self):
         return f'{self.code} sent to {self.phone}'
     
     @property
     def is_expired(self):
-        return timezone.now() > self.created_at + timedelta(minutes=3)
\ No newline at end of file
+        return timezone.now() > self.created_at + OTP_TTL
+
+class SMSMessage(models.Model):
+    """An outgoing text message, queued by request handlers and delivered by the `send_sms` worker."""
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    phone = models.CharField(verbose_name='Phone Number', max_length=11)
+    body = models.TextField()
+    status = models.CharField(max_length=10, default=PENDING, choices=[
+        (PENDING, 'pending'),
+        (SENDING, 'sending'),
+        (SENT, 'sent'),
+        (FAILED, 'failed')])
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='sms_outbox_due_idx'),
+            models.Index(fields=['status', 'created_at'], name='sms_outbox_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.status} message to {self.phone}'
@@ -0,0 +1,128 @@
+import enum
+import secrets
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+from .models import OTPCode, OTP_TTL
+
+
+# Wrong codes accepted per issued code before it is locked.
+MAX_ATTEMPTS = 5
+# How long the database backend keeps issued codes around.
+RETENTION = timedelta(days=1)
+
+
+class OTPStatus(enum.Enum):
+    VALID = 'valid'
+    INVALID = 'invalid'
+    EXPIRED = 'expired'
+    LOCKED = 'locked'
+
+
+def generate_code():
+    return str(secrets.randbelow(900000) + 100000)
+
+
+class DatabaseOTPBackend:
+    """
+    Codes in the OTPCode table. Each lookup reads only the newest code of a
+    phone through the (phone, -created_at) index; a used code is deleted and
+    `purge()` drops history older than RETENTION.
+    """
+
+    def latest(self, phone):
+        return OTPCode.objects.filter(phone=phone).order_by('-created_at').first()
+
+    def issue(self, phone):
+        """Store and return a new code, or None while the previous one is still valid."""
+        last = self.latest(phone)
+        if last and not last.is_expired:
+            return None
+        return OTPCode.objects.create(phone=phone, code=generate_code()).code
+
+    def verify(self, phone, code):
+        otp = self.latest(phone)
+        if otp is None:
+            return OTPStatus.INVALID
+        if otp.attempts >= MAX_ATTEMPTS:
+            return OTPStatus.LOCKED
+        # both the attempt count and the use of a code are settled by conditional writes,
+        # so concurrent requests cannot exceed MAX_ATTEMPTS or use one code twice
+        unlocked = OTPCode.objects.filter(pk=otp.pk, attempts__lt=MAX_ATTEMPTS)
+        if not constant_time_compare(otp.code, str(code)):
+            if not unlocked.update(attempts=F('attempts') + 1):
+                return OTPStatus.LOCKED
+            return OTPStatus.INVALID
+        if otp.is_expired:
+            return OTPStatus.EXPIRED
+        deleted, _ = unlocked.delete()
+        return OTPStatus.VALID if deleted else OTPStatus.INVALID
+
+    def purge(self, batch_size=1000):
+        cutoff = timezone.now() - RETENTION
+        total = 0
+        while True:
+            ids = list(OTPCode.objects.filter(created_at__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return total
+            total += OTPCode.objects.filter(pk__in=ids).delete()[0]
+
+
+class CacheOTPBackend:
+    """
+    Codes in a Django cache alias (OTP_CACHE_ALIAS). They expire with the
+    cache's native TTL, so nothing needs purging, and wrong attempts are
+    counted with atomic `incr` on a key that expires with the code.
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias or getattr(settings, 'OTP_CACHE_ALIAS', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def keys(self, phone):
+        return f'accounts:otp:{phone}:code', f'accounts:otp:{phone}:attempts'
+
+    def issue(self, phone):
+        code_key, attempts_key = self.keys(phone)
+        code = generate_code()
+        timeout = OTP_TTL.total_seconds()
+        if not self.cache.add(code_key, code, timeout=timeout):
+            return None
+        self.cache.set(attempts_key, 0, timeout=timeout)
+        return code
+
+    def verify(self, phone, code):
+        code_key, attempts_key = self.keys(phone)
+        stored = self.cache.get(code_key)
+        if stored is None:
+            return OTPStatus.INVALID
+        try:
+            attempts = self.cache.incr(attempts_key)
+        except ValueError:
+            attempts = MAX_ATTEMPTS + 1
+        if attempts > MAX_ATTEMPTS:
+            return OTPStatus.LOCKED
+        if not constant_time_compare(stored, str(code)):
+            return OTPStatus.INVALID
+        self.cache.delete_many([code_key, attempts_key])
+        return OTPStatus.VALID
+
+    def purge(self, batch_size=None):
+        return 0
+
+
+_backends = {}
+
+
+def get_otp_backend():
+    path = getattr(settings, 'OTP_BACKEND', 'accounts.otp.DatabaseOTPBackend')
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.images import SrcsetField
 from .models import User, UserProfile, SocialLink, OTPCode
 from rest_framework.validators import UniqueValidator
 import re
@@ -64,10 +65,15 @@ class SocialLinkSerializer(serializers.ModelSerializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     social_links = SocialLinkSerializer(source='user.social_links', many=True, read_only=True)
+    picture_srcset = SrcsetField(source='picture_variants')
+    followers_count = serializers.ReadOnlyField(source='user.followers_count')
+    following_count = serializers.ReadOnlyField(source='user.following_count')
+    subscribers_count = serializers.ReadOnlyField(source='user.subscribers_count')
     
     class Meta:
         model = UserProfile
-        fields = ['name', 'surname', 'picture', 'bio', 'birth_date', 'gender', 'social_links']
+        fields = ['name', 'surname', 'picture', 'picture_srcset', 'bio', 'birth_date', 'gender', 'social_links',
+                  'followers_count', 'following_count', 'subscribers_count']
 
     def validate(self, attrs):
         if self.instance:
@@ -80,6 +86,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class ProfileCardSerializer(UserProfileSerializer):
+    username = serializers.ReadOnlyField(source='user.username')
+
+    class Meta(UserProfileSerializer.Meta):
+        fields = ['username', *UserProfileSerializer.Meta.fields]
+
+
 class OTPLoginSerializer(serializers.ModelSerializer):
     class Meta:
         model = OTPCode
@@ -1,9 +1,37 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from .models import User, UserProfile
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+from core.images import needs_variants, schedule_variants
+from .authentication import invalidate_cached_user
+from .cards import invalidate_card
+from .models import User, UserProfile, SocialLink
 
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
\ No newline at end of file
+        UserProfile.objects.create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=SocialLink)
+def touch_profile(sender, instance, **kwargs):
+    UserProfile.objects.filter(user_id=instance.user_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=UserProfile)
+def render_picture_variants(sender, instance, **kwargs):
+    if needs_variants(instance, 'picture', 'picture_variants'):
+        schedule_variants(instance, 'picture', 'picture_variants')
+
+
+@receiver([post_save, post_delete], sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=UserProfile)
+@receiver([post_save, post_delete], sender=SocialLink)
+def drop_profile_card(sender, instance, **kwargs):
+    invalidate_card(instance.pk if sender is User else instance.user_id)
+
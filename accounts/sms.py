@@ -0,0 +1,132 @@
+import logging
+import math
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import SMSMessage
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Retry delay after the n-th failure: BACKOFF_BASE * 2**(n-1), capped, with +-20% jitter.
+BACKOFF_BASE = timedelta(seconds=10)
+BACKOFF_MAX = timedelta(minutes=10)
+# A claimed message not finished within LEASE is picked up again by another worker.
+LEASE = timedelta(minutes=2)
+
+
+class SMSDeliveryError(Exception):
+    pass
+
+
+class KavenegarProvider:
+    def __init__(self):
+        from kavenegar import KavenegarAPI
+        self.api = KavenegarAPI(getattr(settings, 'KAVENEGAR_API_KEY', ''))
+        self.sender = getattr(settings, 'KAVENEGAR_SENDER', '')
+
+    def send(self, phone, body):
+        from kavenegar import APIException, HTTPException
+        try:
+            self.api.sms_send({'sender': self.sender, 'receptor': phone, 'message': body})
+        except (APIException, HTTPException) as err:
+            raise SMSDeliveryError(str(err)) from err
+
+
+class FakeSMSProvider:
+    """Records messages in memory instead of sending them; `fail_next` makes the next sends fail."""
+    sent = []
+    fail_next = 0
+
+    def send(self, phone, body):
+        if FakeSMSProvider.fail_next:
+            FakeSMSProvider.fail_next -= 1
+            raise SMSDeliveryError('Simulated provider failure')
+        FakeSMSProvider.sent.append((phone, body))
+
+    @classmethod
+    def reset(cls):
+        cls.sent = []
+        cls.fail_next = 0
+
+
+def get_sms_provider():
+    return import_string(getattr(settings, 'SMS_PROVIDER', 'accounts.sms.KavenegarProvider'))()
+
+
+def enqueue_sms(phone, body):
+    return SMSMessage.objects.create(phone=phone, body=body)
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_batch(batch_size):
+    """Lease up to `batch_size` due messages to this worker and return them."""
+    now = timezone.now()
+    due = Q(status=SMSMessage.PENDING) | Q(status=SMSMessage.SENDING)
+    with transaction.atomic():
+        messages = list(
+            SMSMessage.objects.select_for_update(skip_locked=True)
+            .filter(due, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        SMSMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+            status=SMSMessage.SENDING, next_attempt_at=now + LEASE
+        )
+    return messages
+
+
+def deliver_batch(provider=None, batch_size=100):
+    """Send one batch of due messages; returns (sent, failed) counts for the batch."""
+    provider = provider or get_sms_provider()
+    sent = failed = 0
+    for message in claim_batch(batch_size):
+        message.attempts += 1
+        try:
+            provider.send(message.phone, message.body)
+        except SMSDeliveryError as err:
+            failed += 1
+            message.last_error = str(err)
+            if message.attempts >= MAX_ATTEMPTS:
+                message.status = SMSMessage.FAILED
+                logger.error('SMS %s to %s failed permanently: %s', message.pk, message.phone, err)
+            else:
+                message.status = SMSMessage.PENDING
+                message.next_attempt_at = timezone.now() + backoff(message.attempts)
+                logger.warning('SMS %s to %s failed (attempt %s): %s', message.pk, message.phone, message.attempts, err)
+            message.save(update_fields=['attempts', 'status', 'next_attempt_at', 'last_error'])
+        else:
+            sent += 1
+            message.status = SMSMessage.SENT
+            message.sent_at = timezone.now()
+            # codes must not outlive their delivery
+            message.body = ''
+            message.save(update_fields=['attempts', 'status', 'sent_at', 'body'])
+    return sent, failed
+
+
+def delivery_stats(since=None):
+    """Queue depth, outcomes and delivery latency (seconds) of messages created since `since` (default: 1 hour)."""
+    since = since or timezone.now() - timedelta(hours=1)
+    recent = SMSMessage.objects.filter(created_at__gte=since)
+    counts = dict(recent.values_list('status').annotate(total=Count('pk')).order_by())
+    latencies = sorted(
+        (sent_at - created_at).total_seconds()
+        for created_at, sent_at in recent.filter(status=SMSMessage.SENT).values_list('created_at', 'sent_at')
+    )
+    return {
+        'pending': SMSMessage.objects.filter(status__in=[SMSMessage.PENDING, SMSMessage.SENDING]).count(),
+        'sent': counts.get(SMSMessage.SENT, 0),
+        'failed': counts.get(SMSMessage.FAILED, 0),
+        'retries': recent.filter(attempts__gt=1).count(),
+        'latency_avg': sum(latencies) / len(latencies) if latencies else None,
+        'latency_p95': latencies[math.ceil(len(latencies) * 0.95) - 1] if latencies else None,
+    }
@@ -0,0 +1,11 @@
+from accounts.models import User
+
+
+def make_user(index):
+    """A throwaway user `user<index>`, for tests that need several distinct users."""
+    return User.objects.create_user(
+        phone=f"0912{index:07d}",
+        email=f"user{index}@gmail.com",
+        username=f"user{index}",
+        password="testpassword"
+    )
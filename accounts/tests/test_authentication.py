@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import User
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.admin = User.objects.create_superuser(
+            phone="09987654321",
+            email="admin@gmail.com",
+            username="admin",
+            password="testpassword"
+        )
+        self.url = reverse('accounts:profile-me')
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_user_row_is_cached_between_requests(self):
+        self.authenticate(self.user)
+        first = self.count_queries()
+        self.assertEqual(self.count_queries(), first - 1)
+
+    def test_deactivation_applies_immediately(self):
+        self.authenticate(self.user)
+        self.client.get(self.url)
+
+        self.client.force_authenticate(user=self.admin)
+        self.client.delete(reverse('accounts:admin-detail', kwargs={'pk': self.user.pk}))
+        self.client.force_authenticate(user=None)
+
+        self.authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_admin_flag_change_applies_immediately(self):
+        self.authenticate(self.user)
+        admin_list = reverse('accounts:admin-list')
+        self.assertEqual(self.client.get(admin_list).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_admin = True
+        self.user.save()
+        self.assertEqual(self.client.get(admin_list).status_code, status.HTTP_200_OK)
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User, UserProfile, SocialLink
+
+
+class ProfileCardTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                phone=f"0912000{i:04d}",
+                email=f"user{i}@gmail.com",
+                username=f"user{i}",
+                password="testpassword"
+            )
+            for i in range(4)
+        ]
+        for user in self.users:
+            SocialLink.objects.create(user=user, label="Site", link=f"https://{user.username}.example.com")
+        self.url = reverse('accounts:profiles-cards')
+
+    def test_cards_by_ids_and_usernames_in_request_order(self):
+        ids = f'{self.users[2].pk},{self.users[0].pk}'
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'ids': ids, 'usernames': 'user1,nobody,user0'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([card['username'] for card in response.data], ['user2', 'user0', 'user1'])
+        self.assertEqual(response.data[0]['social_links'], [{'label': 'Site', 'link': 'https://user2.example.com'}])
+
+    def test_cached_cards_need_no_query(self):
+        ids = ','.join(str(user.pk) for user in self.users)
+        first = self.client.get(self.url, {'ids': ids})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {'ids': ids})
+        self.assertEqual(first.data, second.data)
+
+    def test_profile_and_link_changes_invalidate_the_card(self):
+        params = {'ids': str(self.users[0].pk)}
+        self.client.get(self.url, params)
+
+        profile = UserProfile.objects.get(user=self.users[0])
+        profile.bio = "Hello"
+        profile.save()
+        self.assertEqual(self.client.get(self.url, params).data[0]['bio'], "Hello")
+
+        SocialLink.objects.filter(user=self.users[0]).delete()
+        self.client.get(self.url, params)
+        SocialLink.objects.create(user=self.users[0], label="Blog", link="https://blog.example.com")
+        self.assertEqual(self.client.get(self.url, params).data[0]['social_links'][0]['label'], "Blog")
+
+    def test_rejects_bad_batches(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'ids': 'a,b'}).status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = ','.join(str(i) for i in range(101))
+        self.assertEqual(self.client.get(self.url, {'ids': too_many}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_profile_list_query_count_is_constant(self):
+        list_url = reverse('accounts:profiles-list')
+        with self.assertNumQueries(2):
+            self.client.get(list_url)
+        for i in range(4, 10):
+            user = User.objects.create_user(phone=f"0912000{i:04d}", email=f"user{i}@gmail.com",
+                                            username=f"user{i}", password="testpassword")
+            SocialLink.objects.create(user=user, label="Site", link="https://example.com")
+        with self.assertNumQueries(2):
+            response = self.client.get(list_url)
+        self.assertEqual(len(response.data['results']), 10)
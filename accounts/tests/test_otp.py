@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User, OTPCode
+from accounts.otp import CacheOTPBackend, DatabaseOTPBackend, OTPStatus, MAX_ATTEMPTS
+
+
+class DatabaseOTPBackendTests(TestCase):
+
+    def setUp(self):
+        self.backend = DatabaseOTPBackend()
+        self.phone = "09123456789"
+
+    def test_only_the_latest_code_is_accepted(self):
+        old = OTPCode.objects.create(phone=self.phone, code="111111")
+        OTPCode.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+        code = self.backend.issue(self.phone)
+
+        self.assertEqual(self.backend.verify(self.phone, "111111"), OTPStatus.INVALID)
+        self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.VALID)
+        self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.INVALID)
+
+    def test_issue_refuses_while_a_code_is_valid(self):
+        self.assertIsNotNone(self.backend.issue(self.phone))
+        self.assertIsNone(self.backend.issue(self.phone))
+
+    def test_locks_after_too_many_attempts(self):
+        code = self.backend.issue(self.phone)
+        for _ in range(MAX_ATTEMPTS):
+            self.assertEqual(self.backend.verify(self.phone, "000000"), OTPStatus.INVALID)
+        self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.LOCKED)
+
+    def test_concurrent_reads_use_a_code_once(self):
+        code = self.backend.issue(self.phone)
+        # both requests read the row before either consumes it
+        otp = self.backend.latest(self.phone)
+        with mock.patch.object(self.backend, 'latest', return_value=otp):
+            self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.VALID)
+            self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.INVALID)
+
+    def test_concurrent_wrong_attempts_stop_at_the_limit(self):
+        self.backend.issue(self.phone)
+        otp = self.backend.latest(self.phone)
+        with mock.patch.object(self.backend, 'latest', return_value=otp):
+            statuses = [self.backend.verify(self.phone, "000000") for _ in range(MAX_ATTEMPTS + 2)]
+
+        self.assertEqual(statuses.count(OTPStatus.INVALID), MAX_ATTEMPTS)
+        self.assertEqual(statuses[-2:], [OTPStatus.LOCKED, OTPStatus.LOCKED])
+        self.assertEqual(OTPCode.objects.get(pk=otp.pk).attempts, MAX_ATTEMPTS)
+
+    def test_lookup_uses_the_phone_index(self):
+        from django.db import connection
+        sql, params = OTPCode.objects.filter(phone=self.phone).order_by('-created_at').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('otp_phone_created_idx', plan)
+
+    def test_purge_command_drops_old_codes(self):
+        old = OTPCode.objects.create(phone=self.phone, code="111111")
+        OTPCode.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+        OTPCode.objects.create(phone=self.phone, code="222222")
+
+        out = StringIO()
+        call_command('purge_otp_codes', stdout=out)
+        self.assertIn('1 codes purged', out.getvalue())
+        self.assertEqual(list(OTPCode.objects.values_list('code', flat=True)), ["222222"])
+
+
+class CacheOTPBackendTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.backend = CacheOTPBackend()
+        self.phone = "09123456789"
+
+    def test_issue_and_verify(self):
+        code = self.backend.issue(self.phone)
+        self.assertIsNone(self.backend.issue(self.phone))
+        self.assertEqual(self.backend.verify(self.phone, "000000"), OTPStatus.INVALID)
+        self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.VALID)
+        self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.INVALID)
+        self.assertFalse(OTPCode.objects.exists())
+
+    def test_locks_after_too_many_attempts(self):
+        code = self.backend.issue(self.phone)
+        for _ in range(MAX_ATTEMPTS):
+            self.backend.verify(self.phone, "000000")
+        self.assertEqual(self.backend.verify(self.phone, code), OTPStatus.LOCKED)
+
+
+@override_settings(OTP_BACKEND='accounts.otp.CacheOTPBackend')
+class CacheOTPLoginTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.phone = "09123456789"
+        User.objects.create_user(username='testuser', email='testuser@gmail.com',
+                                 password='testpassword', phone=self.phone)
+
+    def test_login_with_cached_code(self):
+        code = CacheOTPBackend().issue(self.phone)
+        response = self.client.post(reverse('accounts:token_by_otp'), {'phone': self.phone, 'code': code})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+
+    def test_too_many_attempts(self):
+        CacheOTPBackend().issue(self.phone)
+        url = reverse('accounts:token_by_otp')
+        for _ in range(MAX_ATTEMPTS):
+            self.client.post(url, {'phone': self.phone, 'code': '000000'})
+        response = self.client.post(url, {'phone': self.phone, 'code': '000000'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
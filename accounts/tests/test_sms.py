@@ -0,0 +1,77 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from accounts.models import User, SMSMessage
+from accounts.sms import FakeSMSProvider, deliver_batch, delivery_stats, enqueue_sms, MAX_ATTEMPTS
+
+
+@override_settings(SMS_PROVIDER='accounts.sms.FakeSMSProvider')
+class SMSOutboxTests(TestCase):
+
+    def setUp(self):
+        FakeSMSProvider.reset()
+
+    def test_delivers_due_messages_and_redacts_them(self):
+        enqueue_sms("09123456789", "code 123456")
+        enqueue_sms("09987654321", "code 654321")
+
+        self.assertEqual(deliver_batch(batch_size=10), (2, 0))
+        self.assertEqual(FakeSMSProvider.sent, [("09123456789", "code 123456"), ("09987654321", "code 654321")])
+        self.assertFalse(SMSMessage.objects.exclude(status=SMSMessage.SENT).exists())
+        self.assertFalse(SMSMessage.objects.exclude(body='').exists())
+
+    def test_failures_are_retried_with_backoff(self):
+        message = enqueue_sms("09123456789", "code 123456")
+        FakeSMSProvider.fail_next = 1
+
+        self.assertEqual(deliver_batch(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual(message.status, SMSMessage.PENDING)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertEqual(deliver_batch(), (0, 0))
+
+        SMSMessage.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_batch(), (1, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        message = enqueue_sms("09123456789", "code 123456")
+        FakeSMSProvider.fail_next = MAX_ATTEMPTS
+        for _ in range(MAX_ATTEMPTS):
+            SMSMessage.objects.update(next_attempt_at=timezone.now())
+            deliver_batch()
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, SMSMessage.FAILED)
+        self.assertEqual(message.attempts, MAX_ATTEMPTS)
+
+    def test_expired_lease_is_reclaimed(self):
+        enqueue_sms("09123456789", "code 123456")
+        SMSMessage.objects.update(status=SMSMessage.SENDING, next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_batch(), (1, 0))
+
+    def test_stats_and_worker_command(self):
+        enqueue_sms("09123456789", "code 123456")
+        out = StringIO()
+        call_command('send_sms', '--once', stdout=out)
+        self.assertIn('1 sent, 0 failed', out.getvalue())
+
+        stats = delivery_stats()
+        self.assertEqual((stats['pending'], stats['sent'], stats['failed']), (0, 1, 0))
+        self.assertIsNotNone(stats['latency_p95'])
+
+
+class SendOTPOutboxTests(APITestCase):
+
+    def test_send_otp_only_queues_the_message(self):
+        phone = "09123456789"
+        User.objects.create_user(username='testuser', email='testuser@gmail.com', password='testpassword', phone=phone)
+
+        response = self.client.post(reverse('accounts:send_otp_code'), {'phone': phone})
+
+        self.assertEqual(response.status_code, 200)
+        message = SMSMessage.objects.get()
+        self.assertEqual((message.phone, message.status), (phone, SMSMessage.PENDING))
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import User
+from accounts.tokens import BloomFilter, blacklist_filter
+
+
+class BloomFilterTests(TestCase):
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(1000)
+        for i in range(1000):
+            bloom.add(f'member-{i}')
+
+        self.assertTrue(all(f'member-{i}' in bloom for i in range(1000)))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class BlacklistFilterTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        blacklist_filter.clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.refresh_url = reverse('token_refresh')
+
+    def refresh(self, token):
+        return self.client.post(self.refresh_url, {'refresh': str(token)})
+
+    def test_refresh_skips_the_blacklist_table(self):
+        self.refresh(RefreshToken.for_user(self.user))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh(RefreshToken.for_user(self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('token_blacklist_blacklistedtoken' in query['sql'] for query in queries))
+
+    def test_logout_blacklists_through_the_filter(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('accounts:user_logout'), {'refresh': str(token)})
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(BLACKLIST_SYNC_INTERVAL=0)
+    def test_blacklisting_elsewhere_is_picked_up_from_the_database(self):
+        token = RefreshToken.for_user(self.user)
+        self.refresh(token)
+        # another process (or the admin) blacklists the token without touching this filter
+        outstanding = OutstandingToken.objects.get(jti=token['jti'])
+        BlacklistedToken.objects.create(token=outstanding)
+
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_rows_do_not_force_rebuilds(self):
+        now = timezone.now()
+        live = OutstandingToken.objects.create(jti='live', token='t', expires_at=now + timedelta(days=1))
+        expired = OutstandingToken.objects.create(jti='expired', token='t', expires_at=now - timedelta(days=1))
+        BlacklistedToken.objects.create(token=live)
+        newest = BlacklistedToken.objects.create(token=expired)
+        blacklist_filter.warm()
+        self.assertEqual(blacklist_filter._last_id, newest.pk)
+
+        token = OutstandingToken.objects.create(jti='new', token='t', expires_at=now + timedelta(days=1))
+        BlacklistedToken.objects.create(token=token)
+        bloom = blacklist_filter._filter
+        blacklist_filter.sync(force=True)
+
+        self.assertIs(blacklist_filter._filter, bloom)
+        self.assertTrue(blacklist_filter.might_contain('new'))
+
+    def test_add_needs_no_query(self):
+        blacklist_filter.warm()
+        with self.assertNumQueries(0):
+            blacklist_filter.add('logged-out')
+        self.assertTrue(blacklist_filter.might_contain('logged-out'))
+
+
+class PurgeExpiredTokensTests(TestCase):
+
+    def test_purges_expired_tokens_in_batches(self):
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(jti=f'old-{i}', token='t', expires_at=now - timedelta(days=1))
+            BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(jti='live', token='t', expires_at=now + timedelta(days=1))
+
+        out = StringIO()
+        call_command('purge_expired_tokens', '--batch-size', '2', stdout=out)
+
+        self.assertIn('5 expired tokens purged', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -66,6 +66,15 @@ class AdminUserViewSetTest(APITestCase):
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_streamed_list_matches_rendered_list(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.list_url)
+        streamed = self.client.get(self.list_url, {'stream': '1'})
+
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(b''.join(streamed.streaming_content), response.content)
+        self.assertEqual(streamed['Content-Type'], response['Content-Type'])
     
     def test_list_users_as_regular_user_forbidden(self):
         self.client.force_authenticate(user=self.regular_user)
@@ -223,8 +232,9 @@ class ListRetrieveProfileView(APITestCase):
         response = self.client.get(self.list_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], "Ali")
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], "Ali")
+        self.assertIsNone(response.data['next'])
 
     def test_retrieve_profile(self):
         response = self.client.get(self.detail_url)
@@ -423,4 +433,29 @@ class OTPLoginViewTests(APITestCase):
         response = self.client.post(self.url, data)
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.data['detail'], 'There is no user with this number')
\ No newline at end of file
+        self.assertEqual(response.data['detail'], 'There is no user with this number')
+
+class ProfileConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', 
+            email='testuser@gmail.com', 
+            password='testpassword',
+            phone='09123456789'
+        )
+        self.profile = UserProfile.objects.get(user=self.user)
+        self.detail_url = reverse('accounts:profiles-detail', kwargs={'pk': self.profile.pk})
+
+    def test_unchanged_profile_returns_304(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_social_link_change_invalidates(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        SocialLink.objects.create(user=self.user, label="Github", link="https://github.com/test")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['social_links']), 1)
@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings, sized for `capacity` items at `error_rate` false positives."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    """
+    In-process Bloom filter over the JTIs of blacklisted, unexpired tokens.
+
+    A JTI the filter does not contain is certainly not blacklisted, which
+    answers the common refresh without the blacklist join. A hit is confirmed
+    against BlacklistedToken. The filter is resynced from the database itself:
+    at most every BLACKLIST_SYNC_INTERVAL seconds it reads the row count and
+    highest id of BlacklistedToken, so rows written by any process (logout in
+    another worker, the admin, a shell) are seen within that interval. New rows
+    are folded in incrementally; a change the new rows do not explain (deleted
+    rows, ids committed out of order) rebuilds the filter, as does outgrowing
+    its capacity.
+    """
+    min_capacity = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    @property
+    def interval(self):
+        return getattr(settings, 'BLACKLIST_SYNC_INTERVAL', 5.0)
+
+    def clear(self):
+        self._filter = None
+        self._signature = None
+        self._last_id = 0
+        self._checked_at = None
+
+    def might_contain(self, jti):
+        self.sync()
+        return jti in self._filter
+
+    def add(self, jti):
+        # the periodic sync reconciles with the table; until the filter is built it reads the row anyway
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def warm(self):
+        """Build the filter now (at worker start) so the first refresh does not pay for it."""
+        try:
+            self.sync(force=True)
+        except DatabaseError:
+            logger.warning('Token blacklist filter not built at startup; it will be built on first use', exc_info=True)
+
+    def sync(self, force=False):
+        now = time.monotonic()
+        if not force and self._filter is not None and now - self._checked_at < self.interval:
+            return
+        with self._lock:
+            totals = BlacklistedToken.objects.aggregate(count=Count('id'), last_id=Max('id'))
+            signature = (totals['count'], totals['last_id'] or 0)
+            if self._filter is None:
+                self._rebuild(signature[1])
+            elif signature != self._signature:
+                rows = list(
+                    BlacklistedToken.objects.filter(id__gt=self._last_id).order_by('id').values_list('id', 'token__jti')
+                )
+                if (
+                    self._signature[0] + len(rows) != signature[0]
+                    or self._filter.count + len(rows) > self._filter.capacity
+                ):
+                    self._rebuild(signature[1])
+                else:
+                    for _row_id, jti in rows:
+                        self._filter.add(jti)
+                    if rows:
+                        self._last_id = rows[-1][0]
+            self._signature = signature
+            self._checked_at = now
+
+    def _rebuild(self, last_id):
+        # only unexpired tokens need to be in the filter, but later syncs read on from the newest row of any kind
+        rows = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .order_by('id').values_list('id', 'token__jti')
+        )
+        bloom = BloomFilter(max(self.min_capacity, 2 * len(rows)))
+        for _row_id, jti in rows:
+            bloom.add(jti)
+        self._filter = bloom
+        self._last_id = max(last_id, rows[-1][0] if rows else 0)
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class FilteredRefreshToken(RefreshToken):
+    """A refresh token whose blacklist check and blacklisting go through `blacklist_filter`."""
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if blacklist_filter.might_contain(jti) and BlacklistedToken.objects.filter(token__jti=jti).exists():
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
+
+
+def purge_expired_tokens(batch_size=1000):
+    """Delete expired outstanding tokens (and, by cascade, their blacklist rows) in batches."""
+    total = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=timezone.now()).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        total += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+    return total
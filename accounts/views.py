@@ -1,6 +1,6 @@
 from rest_framework.generics import CreateAPIView
 from rest_framework.mixins import ListModelMixin, UpdateModelMixin, DestroyModelMixin, RetrieveModelMixin
-from .models import User, UserProfile, SocialLink, OTPCode
+from .models import User, UserProfile, SocialLink
 from .serializers import UserRegisterSerializer, AdminUserSerializer, UserProfileSerializer, SocialLinkSerializer, OTPLoginSerializer
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
@@ -12,15 +12,20 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
-import random, re
+import re
 from uttils import send_otp_code
+from .otp import get_otp_backend, OTPStatus
+from .tokens import FilteredRefreshToken
+from core.pagination import KeysetPagination
+from core.mixins import ConditionalGetMixin, EagerLoadingMixin, StreamingListMixin
+from .cards import get_cards, MAX_BATCH
 
 
 class UserRegisterView(CreateAPIView):
     serializer_class = UserRegisterSerializer
 
 
-class AdminUserViewSet(ModelViewSet):
+class AdminUserViewSet(StreamingListMixin, ModelViewSet):
     queryset = User.objects.all()
     permission_classes = [IsAdminUser,]
     serializer_class = AdminUserSerializer
@@ -36,7 +41,7 @@ class UserLogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data['refresh']
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
 
             if token.payload['user_id'] != request.user.id:
                 return Response(data={'detail':'Token does not belongs to authentication user'},
@@ -66,9 +71,40 @@ class SocialLinkViewSet(ModelViewSet):
         serializer.save(user=user)
 
 
-class ListRetrieveProfileView(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class ListRetrieveProfileView(ConditionalGetMixin, StreamingListMixin, EagerLoadingMixin, ListModelMixin,
+                              RetrieveModelMixin, GenericViewSet):
     serializer_class = UserProfileSerializer
     queryset = UserProfile.objects.all()
+    pagination_class = KeysetPagination
+    ordering = ('created_at', 'id')
+    select_related_fields = ('user',)
+    prefetch_related_fields = ('user__social_links',)
+    query_budget = 2
+    validator_fields = ('id', 'updated_at', 'user__followers_count', 'user__following_count', 'user__subscribers_count')
+    last_modified_field = None
+
+    @action(detail=False, methods=['get',], url_path='cards')
+    def cards(self, request):
+        """Profile cards for `?ids=1,2` (user ids) and/or `?usernames=a,b`, in the order asked."""
+        ids = self.split_param('ids')
+        usernames = self.split_param('usernames')
+        if not all(value.isdigit() for value in ids):
+            raise serializers.ValidationError({'ids': 'Must be a comma separated list of user ids'})
+        if not ids and not usernames:
+            raise serializers.ValidationError({'detail': 'Pass ids or usernames'})
+        if len(ids) + len(usernames) > MAX_BATCH:
+            raise serializers.ValidationError({'detail': f'At most {MAX_BATCH} cards per request'})
+
+        user_ids = [int(value) for value in ids]
+        if usernames:
+            by_username = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+            user_ids += [by_username[name] for name in usernames if name in by_username]
+
+        cards = get_cards(list(dict.fromkeys(user_ids)), request)
+        return Response([cards[user_id] for user_id in dict.fromkeys(user_ids) if user_id in cards])
+
+    def split_param(self, name):
+        return [value.strip() for value in self.request.query_params.get(name, '').split(',') if value.strip()]
 
 
 class UserProfileView(UpdateModelMixin, DestroyModelMixin, GenericViewSet):
@@ -97,13 +133,11 @@ class SendOTPView(APIView):
         if not User.objects.filter(phone=phone, is_active=True).exists():
             return Response({'detail':'There is no user with this number'}, status=status.HTTP_400_BAD_REQUEST)
         
-        last_otp= OTPCode.objects.filter(phone=phone).order_by('-created_at').first()
-        if last_otp and not last_otp.is_expired:
+        code = get_otp_backend().issue(phone)
+        if code is None:
             return Response({'detail':"Code sent recently, Please wait"}, status=status.HTTP_400_BAD_REQUEST)
 
-        random_code = random.randint(100000, 999999)
-        OTPCode.objects.create(phone=phone, code=random_code)
-        send_otp_code(phone_number=phone, code=random_code)
+        send_otp_code(phone_number=phone, code=code)
 
         return Response({'phone':phone, 'detail':'Verification code sent'}, status=status.HTTP_200_OK)
 
@@ -117,12 +151,13 @@ class OTPLoginView(APIView):
             phone = ser_data.validated_data['phone']
             code = ser_data.validated_data['code']
 
-            try:
-                otp = OTPCode.objects.get(phone=phone, code=code)
-            except OTPCode.DoesNotExist:
+            result = get_otp_backend().verify(phone, code)
+            if result is OTPStatus.INVALID:
                 return Response({'detail': 'Invalid code or phone'}, status=status.HTTP_400_BAD_REQUEST)
-            if otp.is_expired:
+            if result is OTPStatus.EXPIRED:
                 return Response({'detail': 'OTP is expired'}, status=status.HTTP_400_BAD_REQUEST)
+            if result is OTPStatus.LOCKED:
+                return Response({'detail': 'Too many attempts, request a new code'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
             
             try:
                 user = User.objects.get(phone=phone)
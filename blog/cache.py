@@ -0,0 +1,6 @@
+from core.cache import VersionedCache
+
+
+# Public post list and detail responses; bumped by blog.signals whenever a
+# post, tag, category or like changes.
+post_response_cache = VersionedCache('blog:posts', alias='responses', timeout=60 * 10)
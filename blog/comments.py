@@ -0,0 +1,78 @@
+from collections import defaultdict
+from .models import Comment, thread_position
+
+
+def build_comment_tree(comments, max_depth=None, max_replies=None):
+    """
+    Link a flat list of comments into threads in memory and return the roots.
+    Every kept comment gets its replies on `tree_replies`, cut at `max_depth`
+    levels below the roots and at `max_replies` replies per comment.
+    Replies whose parent is not in `comments` are dropped with their subtree.
+    """
+    children = defaultdict(list)
+    for comment in comments:
+        children[comment.parent_id].append(comment)
+
+    roots = children[None]
+    level, depth = roots, 0
+    while level:
+        next_level = []
+        for comment in level:
+            replies = children.get(comment.id, []) if max_depth is None or depth < max_depth else []
+            if max_replies is not None:
+                replies = replies[:max_replies]
+            comment.tree_replies = replies
+            next_level.extend(replies)
+        level, depth = next_level, depth + 1
+    return roots
+
+
+def load_comment_tree(post, roots=None, max_depth=None, max_replies=None):
+    """
+    Return the threaded approved comments of `post`.
+    Without `roots` the whole discussion is fetched in one query. With a page of
+    root comments every reply of those threads (down to `max_depth`) is fetched
+    by its stored `root` in one more query, however deep the threads go.
+    """
+    if roots is None:
+        comments = list(
+            Comment.objects.filter(post=post, is_approved=True)
+            .select_related('user')
+            .order_by('created_at', 'id')
+        )
+    else:
+        comments = list(roots)
+        if comments and max_depth != 0:
+            replies = Comment.objects.filter(root_id__in=[comment.id for comment in comments], is_approved=True)
+            if max_depth is not None:
+                replies = replies.filter(depth__lte=max_depth)
+            comments.extend(replies.select_related('user').order_by('created_at', 'id'))
+
+    for comment in comments:
+        comment.post = post
+    return build_comment_tree(comments, max_depth=max_depth, max_replies=max_replies)
+
+
+def sync_comment_threads(batch_size=500):
+    """Recompute the stored root and depth of every comment in pk batches; returns the number changed."""
+    last_pk, changed = 0, 0
+    while True:
+        comments = list(
+            Comment.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'parent_id', 'root_id', 'depth')[:batch_size]
+        )
+        if not comments:
+            return changed
+        parent_ids = {comment.parent_id for comment in comments if comment.parent_id}
+        # parents always precede their replies in pk order, so rows of earlier batches are already fixed
+        parents = {parent.pk: parent for parent in Comment.objects.filter(pk__in=parent_ids).only('pk', 'root_id', 'depth')}
+        drifted = []
+        for comment in comments:
+            position = (None, 0) if comment.parent_id is None else thread_position(parents[comment.parent_id])
+            if (comment.root_id, comment.depth) != position:
+                comment.root_id, comment.depth = position
+                drifted.append(comment)
+            if comment.pk in parents:
+                parents[comment.pk] = comment
+        Comment.objects.bulk_update(drifted, ['root', 'depth'])
+        changed += len(drifted)
+        last_pk = comments[-1].pk
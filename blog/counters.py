@@ -0,0 +1,34 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Post, Comment, PostLike, CommentLike
+
+
+def _count_subquery(like_model, fk_name):
+    likes = like_model.objects.filter(**{fk_name: OuterRef('pk')}).order_by()
+    return Coalesce(Subquery(likes.values(fk_name).annotate(total=Count('pk')).values('total')), 0)
+
+
+def post_likes_subquery():
+    return _count_subquery(PostLike, 'post')
+
+
+def comment_likes_subquery():
+    return _count_subquery(CommentLike, 'comment')
+
+
+def drifted_posts(queryset=None):
+    queryset = Post.objects.all() if queryset is None else queryset
+    return queryset.annotate(actual_likes=post_likes_subquery()).exclude(likes_count=F('actual_likes'))
+
+
+def drifted_comments(queryset=None):
+    queryset = Comment.objects.all() if queryset is None else queryset
+    return queryset.annotate(actual_likes=comment_likes_subquery()).exclude(likes_count=F('actual_likes'))
+
+
+def sync_post_like_counts(post_ids):
+    return Post.objects.filter(pk__in=post_ids).update(likes_count=post_likes_subquery())
+
+
+def sync_comment_like_counts(comment_ids):
+    return Comment.objects.filter(pk__in=comment_ids).update(likes_count=comment_likes_subquery())
@@ -0,0 +1,153 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from .models import Post, PostLike
+from .counters import sync_post_like_counts
+from .cache import post_response_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class LikeBuffer:
+    """
+    Coalesces like/unlike intents in process memory and writes them in batches.
+
+    Only the last intent per (user, post) is kept. A flush drops intents whose
+    post or user has been deleted meanwhile, inserts the likes with one
+    `bulk_create(ignore_conflicts=True)`, removes the unlikes with one DELETE
+    per post and recomputes the counters of the touched posts once. The buffer
+    is flushed when it reaches `BLOG_LIKE_BUFFER_SIZE` intents, after a request
+    once the oldest intent is `BLOG_LIKE_BUFFER_INTERVAL` seconds old, and at exit.
+    Flushes triggered by requests log a failed write instead of raising it; the
+    intents stay buffered for the next flush. Enabled with `BLOG_LIKE_BUFFER_ENABLED`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._intents = {}
+        self._flushing = {}
+        self._oldest = None
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'BLOG_LIKE_BUFFER_ENABLED', False)
+
+    @property
+    def batch_size(self):
+        return getattr(settings, 'BLOG_LIKE_BUFFER_SIZE', 500)
+
+    @property
+    def interval(self):
+        return getattr(settings, 'BLOG_LIKE_BUFFER_INTERVAL', 2.0)
+
+    def like(self, user_id, post_id):
+        self._add(user_id, post_id, True)
+
+    def unlike(self, user_id, post_id):
+        self._add(user_id, post_id, False)
+
+    def pending(self, user_id, post_id):
+        """Return the buffered intent for the pair (True liked, False unliked) or None."""
+        with self._lock:
+            key = (user_id, post_id)
+            if key in self._intents:
+                return self._intents[key]
+            return self._flushing.get(key)
+
+    def __len__(self):
+        return len(self._intents)
+
+    def _add(self, user_id, post_id, liked):
+        with self._lock:
+            self._intents[(user_id, post_id)] = liked
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._intents) >= self.batch_size
+        if full:
+            self.flush_quietly()
+
+    def flush_if_due(self):
+        if self._oldest is not None and time.monotonic() - self._oldest >= self.interval:
+            self.flush_quietly()
+
+    def flush_quietly(self):
+        """Flush from a request: a failed write is logged, not raised into the response."""
+        try:
+            return self.flush()
+        except Exception:
+            logger.exception('Flushing %s buffered likes failed; they will be retried', len(self))
+            return 0
+
+    def flush(self):
+        with self._lock:
+            if not self._intents:
+                return 0
+            intents, self._intents, self._oldest = self._intents, {}, None
+            self._flushing.update(intents)
+        try:
+            write_intents(intents)
+        except Exception:
+            with self._lock:
+                for key, liked in intents.items():
+                    self._intents.setdefault(key, liked)
+                self._oldest = self._oldest or time.monotonic()
+            raise
+        finally:
+            with self._lock:
+                for key in intents:
+                    self._flushing.pop(key, None)
+        return len(intents)
+
+
+def write_intents(intents):
+    post_ids = set(Post.objects.filter(pk__in={post_id for _, post_id in intents}).values_list('pk', flat=True))
+    user_ids = set(
+        get_user_model().objects.filter(pk__in={user_id for user_id, _ in intents}).values_list('pk', flat=True)
+    )
+    intents = {
+        (user_id, post_id): liked for (user_id, post_id), liked in intents.items()
+        if post_id in post_ids and user_id in user_ids
+    }
+    if not intents:
+        return
+
+    likes = [PostLike(user_id=user_id, post_id=post_id) for (user_id, post_id), liked in intents.items() if liked]
+    unlikes = defaultdict(list)
+    for (user_id, post_id), liked in intents.items():
+        if not liked:
+            unlikes[post_id].append(user_id)
+
+    with transaction.atomic():
+        PostLike.objects.bulk_create(likes, ignore_conflicts=True, batch_size=500)
+        if unlikes:
+            delete_likes(unlikes)
+        sync_post_like_counts({post_id for _, post_id in intents})
+    post_response_cache.bump()
+
+
+def delete_likes(unlikes):
+    """
+    Remove the likes of {post_id: [user_id, ...]} with one DELETE. A plain DELETE
+    skips the per-row post_delete signals; callers rebuild the counters.
+    """
+    clauses, params = [], []
+    for post_id, user_ids in unlikes.items():
+        clauses.append(f'(post_id = %s AND user_id IN ({", ".join(["%s"] * len(user_ids))}))')
+        params.extend([post_id, *user_ids])
+    with connections[PostLike.objects.db].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {PostLike._meta.db_table} WHERE {" OR ".join(clauses)}', params)
+
+
+like_buffer = LikeBuffer()
+
+
+@atexit.register
+def flush_on_exit():
+    if like_buffer.enabled:
+        like_buffer.flush()
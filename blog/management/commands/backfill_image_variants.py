@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from accounts.models import UserProfile
+from blog.models import Post
+from core.images import process_variants
+
+
+SOURCES = (
+    (Post, 'image', 'image_variants'),
+    (UserProfile, 'picture', 'picture_variants'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Render missing responsive variants of post images and profile pictures.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--force', action='store_true', help='Re-render variants that are already up to date.')
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            mapper = executor.map if options['workers'] > 1 else map
+            for model, field_name, variants_field in SOURCES:
+                pks = self.pending(model, field_name, variants_field, options['force'])
+                total = 0
+                for start in range(0, len(pks), options['batch_size']):
+                    batch = pks[start:start + options['batch_size']]
+                    list(mapper(lambda pk: process_variants(model, pk, field_name, variants_field), batch))
+                    total += len(batch)
+                label = model._meta.verbose_name_plural
+                self.stdout.write(self.style.SUCCESS(f'{total} {label} rendered'))
+
+    @staticmethod
+    def pending(model, field_name, variants_field, force):
+        rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+        return [
+            pk for pk, name, variants in rows.values_list('pk', field_name, variants_field).iterator()
+            if force or (variants or {}).get('source') != name
+        ]
@@ -0,0 +1,47 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+from blog.models import Post
+from blog.post_rows import post_rows, serialize_post_rows
+from blog.serializers import ReadOnlyPostSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare ReadOnlyPostSerializer with the values() fast path on published posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        request = APIRequestFactory().get('/blog/posts/')
+        queryset = Post.objects.filter(is_published=True, is_premium=False).order_by('-created_at', '-id')
+        rows = options['rows']
+        if not queryset.exists():
+            raise CommandError('No published posts to benchmark.')
+
+        def model_serializer():
+            posts = queryset.select_related('author').prefetch_related('tags')[:rows]
+            return ReadOnlyPostSerializer(posts, many=True, context={'request': request}).data
+
+        def fast_path():
+            return serialize_post_rows(post_rows(queryset)[:rows], request)
+
+        if model_serializer() != fast_path():
+            raise CommandError('Fast path output differs from ReadOnlyPostSerializer.')
+
+        slow = self.best_of(model_serializer, options['repeat'])
+        fast = self.best_of(fast_path, options['repeat'])
+        count = min(rows, queryset.count())
+        self.stdout.write(f'ReadOnlyPostSerializer: {slow * 1000:.1f} ms for {count} posts')
+        self.stdout.write(f'values() fast path:     {fast * 1000:.1f} ms for {count} posts')
+        self.stdout.write(self.style.SUCCESS(f'{slow / fast:.1f}x speedup'))
+
+    @staticmethod
+    def best_of(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
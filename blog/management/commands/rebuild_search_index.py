@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from blog.search import rebuild_index, get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of published posts in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options['batch_size'])
+        backend = type(get_search_backend()).__name__
+        self.stdout.write(self.style.SUCCESS(f'{total} posts indexed with {backend}'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from blog.models import Post, summarize
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored excerpt and reading_time of posts in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        last_pk, updated = 0, 0
+        while True:
+            posts = list(Post.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content')[:options['batch_size']])
+            if not posts:
+                break
+            for post in posts:
+                post.excerpt, post.reading_time = summarize(post.content)
+            Post.objects.bulk_update(posts, ['excerpt', 'reading_time'])
+            updated += len(posts)
+            last_pk = posts[-1].pk
+        self.stdout.write(self.style.SUCCESS(f'{updated} posts refreshed'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from blog.comments import sync_comment_threads
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored thread root and depth of comments in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        changed = sync_comment_threads(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{changed} comments synced'))
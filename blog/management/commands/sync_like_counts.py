@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from blog.models import Post, Comment
+from blog.counters import drifted_posts, drifted_comments, sync_post_like_counts, sync_comment_like_counts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or reconcile the stored likes_count of posts and comments in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Rewrite every counter instead of only the drifted ones.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted counters without fixing them.')
+
+    def handle(self, *args, **options):
+        targets = (
+            ('posts', Post, drifted_posts, sync_post_like_counts),
+            ('comments', Comment, drifted_comments, sync_comment_like_counts),
+        )
+        for label, model, drifted, sync in targets:
+            fixed = 0
+            for ids in self.batches(model, options['batch_size']):
+                if not options['rebuild']:
+                    ids = list(drifted(model.objects.filter(pk__in=ids)).values_list('pk', flat=True))
+                if ids and not options['dry_run']:
+                    sync(ids)
+                fixed += len(ids)
+
+            verb = 'drifted' if options['dry_run'] else 'synced'
+            self.stdout.write(self.style.SUCCESS(f'{fixed} {label} {verb}'))
+
+    def batches(self, model, batch_size):
+        last_pk = 0
+        while True:
+            ids = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return
+            yield ids
+            last_pk = ids[-1]
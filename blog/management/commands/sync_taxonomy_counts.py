@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from blog.taxonomy import sync_taxonomy_counts
+
+
+class Command(BaseCommand):
+    help = 'Reconcile the stored published-post counts of categories and tags.'
+
+    def handle(self, *args, **options):
+        categories, tags = sync_taxonomy_counts()
+        self.stdout.write(self.style.SUCCESS(f'{categories} categories and {tags} tags synced'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from blog.trending import update_trending_scores
+
+
+class Command(BaseCommand):
+    help = 'Fold recent likes and comments into the time-decayed trending scores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild every score from the recent window instead of only new activity.')
+
+    def handle(self, *args, **options):
+        total = update_trending_scores(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'{total} posts rescored'))
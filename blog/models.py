@@ -1,22 +1,38 @@
 from django.db import models
 from django.conf import settings
-from django.utils.text import slugify
+from django.utils.html import strip_tags
+from django.utils.text import slugify, Truncator
+import math
 import uuid
 
 
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+
 class Post(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=250, unique=True, blank=True)
     content = models.TextField()
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes')
     image = models.ImageField(upload_to='blog/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey('Category', on_delete=models.SET_NULL, null=True, related_name='posts')
     tags = models.ManyToManyField('Tag', blank=True, related_name='posts')
     is_published = models.BooleanField(default=False)
     is_premium = models.BooleanField(default=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_published', 'is_premium', '-created_at', '-id'], name='post_feed_idx'),
+            models.Index(fields=['author', 'is_published', '-created_at', '-id'], name='post_author_feed_idx'),
+        ]
+
     def __str__(self):
         return self.title
     
@@ -25,36 +41,67 @@ class Post(models.Model):
             base_slug = slugify(self.title)
             unique_identifier = str(uuid.uuid4())[:8]
             self.slug = f"{base_slug}-{unique_identifier}"
+        self.excerpt, self.reading_time = summarize(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt', 'reading_time'}
         return super().save(*args, **kwargs)
-    
-    @property
-    def likes_count(self):
-        return self.likes.count()
+
+
+def summarize(content):
+    """The stored excerpt and reading time (in minutes) of a post body."""
+    text = ' '.join(strip_tags(content or '').split())
+    words = len(text.split())
+    return Truncator(text).chars(EXCERPT_LENGTH), math.ceil(words / WORDS_PER_MINUTE)
+
+
+def thread_position(parent):
+    """The (root id, depth) of a reply to `parent`."""
+    return parent.root_id or parent.pk, parent.depth + 1
 
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='comments')
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='comments')
+    # the thread's root comment (None for roots) and the distance from it, so a thread loads in one query
+    root = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, editable=False,
+                             related_name='thread_comments')
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     content = models.TextField()
     is_approved = models.BooleanField(default=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'parent', 'is_approved', 'created_at', 'id'], name='comment_thread_idx'),
+            models.Index(fields=['root', 'is_approved', 'depth'], name='comment_root_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} comment on {self.post}'
+
+    def save(self, *args, **kwargs):
+        if self.parent_id is None:
+            self.root_id, self.depth = None, 0
+        else:
+            self.root_id, self.depth = thread_position(self.parent)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'root', 'depth'}
+        return super().save(*args, **kwargs)
     
     @property
     def is_reply(self):
         return self.parent is not None
-    
-    @property
-    def likes_count(self):
-        return self.likes.count()
 
 
 class Category(models.Model):
     name = models.CharField(max_length=200, unique=True)
     slug = models.CharField(max_length=200, unique=True, blank=True)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = 'Category'
@@ -70,6 +117,7 @@ class Category(models.Model):
 
 class Tag(models.Model):
     name = models.CharField(max_length=200, unique=True)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -98,4 +146,55 @@ class CommentLike(models.Model):
         ordering = ('-created_at',)
     
     def __str__(self):
-        return f'{self.user.username} liked {self.comment}'
\ No newline at end of file
+        return f'{self.user.username} liked {self.comment}'
+
+
+class SearchTerm(models.Model):
+    """Inverted-index posting used for post search on backends without FTS5."""
+    term = models.CharField(max_length=64)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'post'], name='unique_search_term_post')
+        ]
+
+    def __str__(self):
+        return f'{self.term} in {self.post}'
+
+
+class TimelineEntry(models.Model):
+    """A published post materialized into the home timeline of one of its author's followers."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='timeline_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_timeline_user_post')
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='timeline_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post} in {self.user} timeline'
+
+
+class PostTrendingScore(models.Model):
+    """
+    Time-decayed activity score of a post, stored in log space so that it
+    never needs rescaling: ordering by `score` is ordering by current heat.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField()
+    updated_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', '-post'], name='trending_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post} trending at {self.score:.2f}'
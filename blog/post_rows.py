@@ -0,0 +1,102 @@
+from collections import defaultdict
+from rest_framework import serializers
+from rest_framework.response import Response
+from core.images import build_srcset
+from .models import Post
+from .serializers import ReadOnlyPostSerializer
+from .taxonomy import taxonomy
+
+
+# Output field -> the values() columns it is built from; `tags` comes from a second query.
+ROW_COLUMNS = {
+    'author': ('author__username',),
+    'title': ('title',),
+    'slug': ('slug',),
+    'content': ('content',),
+    'excerpt': ('excerpt',),
+    'reading_time': ('reading_time',),
+    'image': ('image',),
+    'image_srcset': ('image_variants',),
+    'category': ('category_id',),
+    'tags': (),
+    'updated_at': ('updated_at',),
+    'likes_count': ('likes_count',),
+}
+KEY_COLUMNS = ('id', 'created_at')
+
+_datetime = serializers.DateTimeField()
+_storage = Post._meta.get_field('image').storage
+
+
+def _image(row, request):
+    if not row['image']:
+        return None
+    url = _storage.url(row['image'])
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def _category(row):
+    category = taxonomy.category(row['category_id'])
+    return category.name if category else None
+
+
+BUILDERS = {
+    'author': lambda row, tags, request: row['author__username'],
+    'title': lambda row, tags, request: row['title'],
+    'slug': lambda row, tags, request: row['slug'],
+    'content': lambda row, tags, request: row['content'],
+    'excerpt': lambda row, tags, request: row['excerpt'],
+    'reading_time': lambda row, tags, request: row['reading_time'],
+    'image': lambda row, tags, request: _image(row, request),
+    'image_srcset': lambda row, tags, request: build_srcset(row['image_variants'], request),
+    'category': lambda row, tags, request: _category(row),
+    'tags': lambda row, tags, request: tags.get(row['id'], []),
+    'updated_at': lambda row, tags, request: _datetime.to_representation(row['updated_at']),
+    'likes_count': lambda row, tags, request: row['likes_count'],
+}
+
+
+def post_rows(queryset, fields=None, key_columns=KEY_COLUMNS):
+    """Narrow a post queryset to the columns `serialize_post_rows` needs for `fields`, plus the pagination key."""
+    fields = fields or ReadOnlyPostSerializer.Meta.fields
+    columns = dict.fromkeys(('id', *key_columns))
+    for name in fields:
+        columns.update(dict.fromkeys(ROW_COLUMNS[name]))
+    return queryset.prefetch_related(None).values(*columns)
+
+
+def tag_names(post_ids):
+    """Tag names per post id: one query over the through table, names from the taxonomy cache."""
+    links = list(Post.tags.through.objects.filter(post_id__in=post_ids).values_list('post_id', 'tag_id'))
+    tags = taxonomy.tags({tag_id for _, tag_id in links})
+    names = defaultdict(list)
+    for post_id, tag_id in links:
+        if tag_id in tags:
+            names[post_id].append(tags[tag_id].name)
+    return names
+
+
+def serialize_post_rows(rows, request=None, fields=None):
+    """
+    Build the `ReadOnlyPostSerializer` representation of `post_rows()` dicts
+    directly, without instantiating models or serializer fields per row.
+    """
+    fields = fields or ReadOnlyPostSerializer.Meta.fields
+    rows = list(rows)
+    tags = tag_names([row['id'] for row in rows]) if rows and 'tags' in fields else {}
+    builders = [(name, BUILDERS[name]) for name in fields]
+    return [{name: build(row, tags, request) for name, build in builders} for row in rows]
+
+
+class PostRowsListMixin:
+    """Serve `list` through `post_rows()`/`serialize_post_rows()` instead of the model serializer."""
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+        ordering = getattr(self, 'ordering', None)
+        key_columns = [field.lstrip('-') for field in ordering] if ordering else KEY_COLUMNS
+        rows = post_rows(self.filter_queryset(self.get_queryset()), fields, key_columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_post_rows(page, request, fields))
+        return Response(serialize_post_rows(rows, request, fields))
@@ -0,0 +1,161 @@
+import re
+from collections import Counter
+from django.db import connection, transaction
+from django.db.models import Sum
+from .models import Post, SearchTerm
+
+
+FIELD_WEIGHTS = {'title': 3.0, 'content': 1.0, 'tags': 2.0, 'author': 2.0}
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return [token[:64] for token in TOKEN_RE.findall(text.lower())]
+
+
+def post_document(post):
+    return {
+        'title': post.title,
+        'content': post.content,
+        'tags': ' '.join(tag.name for tag in post.tags.all()),
+        'author': post.author.username,
+    }
+
+
+def is_indexable(post):
+    return post.is_published and not post.is_premium
+
+
+def indexable_posts():
+    # only posts SearchPostView may return are indexed, so its LIMIT is applied to visible posts
+    return Post.objects.filter(is_published=True, is_premium=False).select_related('author').prefetch_related('tags').order_by('pk')
+
+
+class FTS5SearchBackend:
+    """Ranks posts with SQLite's FTS5 bm25(); the row id of the virtual table is the post id."""
+    table = 'blog_post_search'
+
+    def create_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                f"USING fts5(title, content, tags, author, tokenize='unicode61')"
+            )
+
+    def index(self, post):
+        self.index_many([post])
+
+    def index_many(self, posts):
+        rows = []
+        for post in posts:
+            document = post_document(post)
+            rows.append((post.pk, document['title'], document['content'], document['tags'], document['author']))
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, content, tags, author) VALUES (%s, %s, %s, %s, %s)', rows
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [post_id])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = ' OR '.join(f'"{token}"' for token in tokens)
+        weights = ', '.join(str(FIELD_WEIGHTS[field]) for field in ('title', 'content', 'tags', 'author'))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s '
+                f'ORDER BY bm25({self.table}, {weights}) LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class InvertedIndexSearchBackend:
+    """Portable index: one SearchTerm row per (term, post) weighted by field and frequency."""
+
+    def create_table(self):
+        pass
+
+    def index(self, post):
+        self.index_many([post])
+
+    def index_many(self, posts):
+        terms = []
+        for post in posts:
+            weights = Counter()
+            for field, text in post_document(post).items():
+                for token in tokenize(text):
+                    weights[token] += FIELD_WEIGHTS[field]
+            terms.extend(SearchTerm(term=term, post_id=post.pk, weight=weight) for term, weight in weights.items())
+        with transaction.atomic():
+            SearchTerm.objects.filter(post__in=[post.pk for post in posts]).delete()
+            SearchTerm.objects.bulk_create(terms, batch_size=1000)
+
+    def remove(self, post_id):
+        SearchTerm.objects.filter(post_id=post_id).delete()
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+    def search(self, query, limit):
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        ranked = (
+            SearchTerm.objects.filter(term__in=tokens)
+            .values('post')
+            .annotate(score=Sum('weight'))
+            .order_by('-score', 'post')
+        )
+        return [row['post'] for row in ranked[:limit]]
+
+
+def fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        _backend = FTS5SearchBackend() if fts5_available() else InvertedIndexSearchBackend()
+    return _backend
+
+
+def sync_post(post):
+    backend = get_search_backend()
+    if is_indexable(post):
+        backend.index(post)
+    else:
+        backend.remove(post.pk)
+
+
+def rebuild_index(batch_size=500):
+    backend = get_search_backend()
+    backend.create_table()
+    backend.clear()
+    total, last_pk = 0, 0
+    while True:
+        posts = list(indexable_posts().filter(pk__gt=last_pk)[:batch_size])
+        if not posts:
+            return total
+        backend.index_many(posts)
+        total += len(posts)
+        last_pk = posts[-1].pk
@@ -1,17 +1,33 @@
 from rest_framework import serializers
+from core.images import SrcsetField
 from .models import Post, Comment, PostLike, CommentLike
+from .taxonomy import taxonomy
+
+
+class CategoryNameField(serializers.ReadOnlyField):
+    """The name of a post's category, read from the in-process taxonomy cache by `category_id`."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'category_id')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        category = taxonomy.category(value)
+        return category.name if category else None
 
 
 class ReadOnlyPostSerializer(serializers.ModelSerializer):
     author  = serializers.ReadOnlyField(source='author.username')
-    category = serializers.SlugRelatedField(read_only=True, slug_field='name')
+    category = CategoryNameField()
     tags = serializers.SlugRelatedField(read_only=True, slug_field='name', many=True)
     likes_count = serializers.ReadOnlyField()
+    image_srcset = SrcsetField(source='image_variants')
 
     class Meta:
         model = Post
-        fields = ['author', 'title', 'slug', 'content', 'image', 'category', 'tags', 'updated_at', 'likes_count']
-        read_only_fields = ['slug', 'likes_count']
+        fields = ['author', 'title', 'slug', 'content', 'excerpt', 'reading_time', 'image', 'image_srcset',
+                  'category', 'tags', 'updated_at', 'likes_count']
+        read_only_fields = ['slug', 'excerpt', 'reading_time', 'likes_count']
 
 
 class UserPostSerilaizer(serializers.ModelSerializer):
@@ -44,8 +60,10 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['post', 'user', 'content', 'created_at', 'comments', 'is_approved', 'likes_count']
 
     def get_comments(self, obj):
-       children = obj.comments.filter(is_approved=True)
-       return CommentSerializer(children, many=True).data
+        children = getattr(obj, 'tree_replies', None)
+        if children is None:
+            children = obj.comments.filter(is_approved=True)
+        return CommentSerializer(children, many=True, context=self.context).data
 
 
 class PostLikeSerializer(serializers.ModelSerializer):
@@ -70,4 +88,16 @@ class CommentLikeSerializer(serializers.ModelSerializer):
             'comment':{'write_only':True},
             'created_at':{'read_only':True},
             'id':{'read_only':True},
-        }
\ No newline at end of file
+        }
+
+
+class CategorySerializer(serializers.Serializer):
+    name = serializers.CharField(read_only=True)
+    slug = serializers.CharField(read_only=True)
+    post_count = serializers.IntegerField(read_only=True)
+
+
+class TagSerializer(serializers.Serializer):
+    name = serializers.CharField(read_only=True)
+    post_count = serializers.IntegerField(read_only=True)
+
@@ -0,0 +1,220 @@
+from django.dispatch import receiver
+from django.core.signals import request_finished
+from django.utils import timezone
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed, post_migrate
+from core.images import needs_variants, schedule_variants
+from relationships.models import Follow
+from relationships.signals import follows_bulk_created
+from .models import Post, Comment, Category, Tag, PostLike, CommentLike
+from .cache import post_response_cache
+from . import search, timeline
+from .like_buffer import like_buffer
+from .slugs import slug_resolver
+from .taxonomy import taxonomy, adjust_post_counts
+
+
+@receiver(post_save, sender=PostLike)
+def increment_post_likes(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') + 1)
+
+
+@receiver(post_delete, sender=PostLike)
+def decrement_post_likes(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, likes_count__gt=0).update(likes_count=F('likes_count') - 1)
+
+
+@receiver(post_save, sender=CommentLike)
+def increment_comment_likes(sender, instance, created, **kwargs):
+    if created:
+        Comment.objects.filter(pk=instance.comment_id).update(likes_count=F('likes_count') + 1)
+
+
+@receiver(post_delete, sender=CommentLike)
+def decrement_comment_likes(sender, instance, **kwargs):
+    Comment.objects.filter(pk=instance.comment_id, likes_count__gt=0).update(likes_count=F('likes_count') - 1)
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=PostLike)
+def invalidate_post_responses(sender, **kwargs):
+    post_response_cache.bump()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_responses_on_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        post_response_cache.bump()
+
+
+@receiver(post_migrate)
+def create_search_index(sender, **kwargs):
+    if sender.name == 'blog':
+        search.get_search_backend().create_table()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    search.sync_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+def reindex_tagged_posts(sender, instance, created, **kwargs):
+    if not created:
+        search.get_search_backend().index_many(list(search.indexable_posts().filter(tags=instance)))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def reindex_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        search.sync_post(instance)
+    elif pk_set:
+        search.get_search_backend().index_many(list(search.indexable_posts().filter(pk__in=pk_set)))
+
+
+@receiver(pre_save, sender=Post)
+def remember_published_state(sender, instance, **kwargs):
+    was_published, category_id = False, None
+    if instance.pk is not None:
+        was_published, category_id = (
+            Post.objects.filter(pk=instance.pk).values_list('is_published', 'category_id').first() or (False, None)
+        )
+    instance._was_published = was_published
+    instance._was_category_id = category_id
+
+
+@receiver(post_save, sender=Post)
+def update_timelines(sender, instance, **kwargs):
+    was_published = getattr(instance, '_was_published', False)
+    if instance.is_published and not was_published:
+        timeline.schedule_fan_out(instance)
+    elif was_published and not instance.is_published:
+        timeline.retract_post(instance)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance, created, **kwargs):
+    if created:
+        timeline.backfill_timeline(instance.follower_id, [instance.author_id])
+
+
+@receiver(follows_bulk_created, sender=Follow)
+def backfill_bulk_follows(sender, follower_id, author_ids, **kwargs):
+    timeline.backfill_timeline(follower_id, author_ids)
+
+
+@receiver(post_delete, sender=Follow)
+def clear_unfollowed_posts(sender, instance, **kwargs):
+    timeline.remove_author_from_timeline(instance.follower_id, instance.author_id)
+
+
+@receiver(request_finished)
+def flush_like_buffer(sender, **kwargs):
+    if like_buffer.enabled:
+        like_buffer.flush_if_due()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def touch_retagged_posts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        Post.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+    elif pk_set:
+        Post.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Tag)
+def touch_tagged_posts(sender, instance, created, **kwargs):
+    if not created:
+        Post.objects.filter(tags=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+def touch_categorized_posts(sender, instance, created, **kwargs):
+    if not created:
+        Post.objects.filter(category=instance).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_resolved_slug(sender, instance, **kwargs):
+    slug_resolver.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def render_image_variants(sender, instance, **kwargs):
+    if needs_variants(instance, 'image', 'image_variants'):
+        schedule_variants(instance, 'image', 'image_variants')
+
+
+@receiver(post_save, sender=Post)
+def update_taxonomy_counts(sender, instance, created, **kwargs):
+    was_published = getattr(instance, '_was_published', False)
+    old_category_id = getattr(instance, '_was_category_id', None)
+    if instance.is_published and not was_published:
+        tag_ids = [] if created else list(instance.tags.values_list('id', flat=True))
+        adjust_post_counts(instance.category_id, tag_ids, +1)
+    elif was_published and not instance.is_published:
+        adjust_post_counts(old_category_id, list(instance.tags.values_list('id', flat=True)), -1)
+    elif instance.is_published and old_category_id != instance.category_id:
+        adjust_post_counts(old_category_id, delta=-1)
+        adjust_post_counts(instance.category_id, delta=+1)
+
+
+@receiver(pre_delete, sender=Post)
+def release_taxonomy_counts(sender, instance, **kwargs):
+    # the tag links are removed by cascade, which sends no m2m_changed
+    if instance.is_published:
+        adjust_post_counts(instance.category_id, list(instance.tags.values_list('id', flat=True)), -1)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    through = Post.tags.through
+    if not reverse:
+        if not instance.is_published:
+            return
+        if action == 'pre_remove':
+            instance._removed_tag_ids = list(
+                through.objects.filter(post=instance, tag_id__in=pk_set).values_list('tag_id', flat=True)
+            )
+        elif action == 'pre_clear':
+            instance._removed_tag_ids = list(through.objects.filter(post=instance).values_list('tag_id', flat=True))
+        elif action == 'post_add':
+            adjust_post_counts(tag_ids=pk_set, delta=+1)
+        elif action in ('post_remove', 'post_clear'):
+            adjust_post_counts(tag_ids=instance.__dict__.pop('_removed_tag_ids', ()), delta=-1)
+        return
+
+    if action in ('pre_remove', 'pre_clear'):
+        linked = through.objects.filter(tag=instance, post__is_published=True)
+        if action == 'pre_remove':
+            linked = linked.filter(post_id__in=pk_set)
+        instance._removed_post_count = linked.count()
+    elif action == 'post_add':
+        added = Post.objects.filter(pk__in=pk_set, is_published=True).count()
+        if added:
+            Tag.objects.filter(pk=instance.pk).update(post_count=F('post_count') + added)
+            taxonomy.invalidate()
+    elif action in ('post_remove', 'post_clear'):
+        removed = instance.__dict__.pop('_removed_post_count', 0)
+        if removed:
+            Tag.objects.filter(pk=instance.pk, post_count__gte=removed).update(post_count=F('post_count') - removed)
+            taxonomy.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_taxonomy(sender, **kwargs):
+    taxonomy.invalidate()
+
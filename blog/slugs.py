@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from .models import Post
+
+
+PostRef = namedtuple('PostRef', ['id', 'is_published', 'is_premium', 'author_id'])
+
+
+class SlugResolver:
+    """
+    Bounded LRU of `Post.slug` -> PostRef shared by the slug-addressed views.
+
+    Entries are dropped by signals when a post is saved or deleted in this
+    process and expire after `ttl` seconds, which bounds staleness for changes
+    made by other processes. Unknown slugs are not cached.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._slugs = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, slug):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(slug)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        row = Post.objects.filter(slug=slug).values_list('id', 'is_published', 'is_premium', 'author_id').first()
+        if row is None:
+            return None
+        ref = PostRef(*row)
+        with self._lock:
+            self._entries[slug] = (ref, now + self.ttl)
+            self._entries.move_to_end(slug)
+            self._slugs[ref.id] = slug
+            while len(self._entries) > self.maxsize:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._slugs.pop(evicted.id, None)
+        return ref
+
+    def invalidate(self, post_id):
+        with self._lock:
+            slug = self._slugs.pop(post_id, None)
+            if slug is not None:
+                self._entries.pop(slug, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._slugs.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+            }
+
+
+slug_resolver = SlugResolver()
+
+
+class ResolvedSlugMixin:
+    """
+    Look posts up by primary key through `slug_resolver` instead of by slug.
+    Views can reject a post before querying it by overriding `is_visible(ref)`.
+    """
+
+    def is_visible(self, ref):
+        return True
+
+    def resolve_post(self, slug):
+        ref = slug_resolver.resolve(slug)
+        if ref is None or not self.is_visible(ref):
+            raise Http404
+        return ref
+
+    def get_lookup_kwargs(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return {'pk': self.resolve_post(self.kwargs[lookup_url_kwarg]).id}
+
+    def get_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        obj = get_object_or_404(queryset, **self.get_lookup_kwargs())
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import namedtuple
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from core.cache import VersionedCache
+from .models import Post, Category, Tag
+
+
+Taxon = namedtuple('Taxon', 'id name slug post_count')
+
+
+class TaxonomyCache:
+    """
+    In-process copy of every category and tag, so post serialization can
+    turn ids into names without a query.
+
+    A version key in the default cache is bumped on every taxonomy or count
+    change; each process compares it at most once per `check_interval`
+    seconds and reloads both tables (two queries) when it moved. The default
+    cache is per-process unless configured otherwise, so a snapshot is also
+    reloaded once it is `max_age` seconds old, and looking up an id it does
+    not hold (a category or tag created by another process) reloads it at once.
+    """
+
+    def __init__(self, namespace='blog:taxonomy', check_interval=1.0, max_age=30.0):
+        self.versions = VersionedCache(namespace)
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.clear()
+
+    def snapshot(self):
+        now = time.monotonic()
+        if now - self._loaded_at >= self.max_age:
+            self._reload()
+        elif now - self._checked_at >= self.check_interval:
+            if self.versions.version() != self._version:
+                self._reload()
+            self._checked_at = now
+        return self._categories, self._tags
+
+    def category(self, category_id):
+        if category_id is None:
+            return None
+        categories = self.snapshot()[0]
+        if category_id not in categories:
+            categories = self._reload()[0]
+        return categories.get(category_id)
+
+    def tags(self, tag_ids):
+        """The taxa of `tag_ids` by id, reloading the snapshot once if any of them is missing."""
+        tags = self.snapshot()[1]
+        if not tags.keys() >= set(tag_ids):
+            tags = self._reload()[1]
+        return tags
+
+    def categories(self):
+        return sorted(self.snapshot()[0].values(), key=lambda taxon: taxon.name)
+
+    def tag_cloud(self):
+        tags = [taxon for taxon in self.snapshot()[1].values() if taxon.post_count]
+        return sorted(tags, key=lambda taxon: (-taxon.post_count, taxon.name))
+
+    def invalidate(self):
+        self.versions.bump()
+        self._checked_at = float('-inf')
+
+    def clear(self):
+        self._version = None
+        self._checked_at = self._loaded_at = float('-inf')
+        self._categories, self._tags = {}, {}
+
+    def _reload(self):
+        with self._lock:
+            version = self.versions.version()
+            categories = {
+                row[0]: Taxon(*row)
+                for row in Category.objects.values_list('id', 'name', 'slug', 'post_count')
+            }
+            tags = {
+                pk: Taxon(pk, name, None, post_count)
+                for pk, name, post_count in Tag.objects.values_list('id', 'name', 'post_count')
+            }
+            self._categories, self._tags, self._version = categories, tags, version
+            self._checked_at = self._loaded_at = time.monotonic()
+            return categories, tags
+
+
+taxonomy = TaxonomyCache()
+
+
+def adjust_post_counts(category_id=None, tag_ids=(), delta=1):
+    """Move the published-post counters of a category and some tags by `delta`."""
+    change = {'post_count': F('post_count') + delta}
+    guard = Q(post_count__gte=-delta) if delta < 0 else Q()
+    if category_id:
+        Category.objects.filter(guard, pk=category_id).update(**change)
+    if tag_ids:
+        Tag.objects.filter(guard, pk__in=tag_ids).update(**change)
+    if category_id or tag_ids:
+        taxonomy.invalidate()
+
+
+def sync_taxonomy_counts():
+    """Recompute every post_count from the published posts; returns (categories, tags) changed."""
+    published = Post.objects.filter(is_published=True)
+    category_counts = Subquery(
+        published.filter(category=OuterRef('pk')).order_by().values('category')
+        .annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField(),
+    )
+    tag_counts = Subquery(
+        published.filter(tags=OuterRef('pk')).order_by().values('tags')
+        .annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField(),
+    )
+    categories = Category.objects.annotate(actual=Coalesce(category_counts, 0)).exclude(post_count=F('actual'))
+    tags = Tag.objects.annotate(actual=Coalesce(tag_counts, 0)).exclude(post_count=F('actual'))
+    changed = (
+        Category.objects.filter(pk__in=list(categories.values_list('pk', flat=True))).update(post_count=Coalesce(category_counts, 0)),
+        Tag.objects.filter(pk__in=list(tags.values_list('pk', flat=True))).update(post_count=Coalesce(tag_counts, 0)),
+    )
+    if any(changed):
+        taxonomy.invalidate()
+    return changed
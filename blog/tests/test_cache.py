@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.cache import post_response_cache
+from blog.models import Post, Category, Tag, PostLike
+
+
+class PostResponseCacheTests(APITestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.category = Category.objects.create(name="Tech")
+        self.post = Post.objects.create(author=self.user, title="Cached", content="content",
+                                        category=self.category, is_published=True)
+        self.list_url = reverse('blog:posts-list')
+        self.detail_url = reverse('blog:posts-detail', kwargs={'slug': self.post.slug})
+
+    def test_second_anonymous_read_is_served_from_cache(self):
+        first = self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+
+    def test_query_parameters_are_part_of_the_key(self):
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url, {'page_size': 1})
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_detail_is_cached(self):
+        self.client.get(self.detail_url)
+        # only the ETag metadata query runs on a hit; the slug is already resolved
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['title'], 'Cached')
+
+    def test_post_change_invalidates(self):
+        self.client.get(self.detail_url)
+        self.post.content = "edited"
+        self.post.save()
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['content'], 'edited')
+
+    def test_like_tag_and_category_changes_invalidate(self):
+        tag = Tag.objects.create(name="python")
+        changes = [
+            lambda: PostLike.objects.create(user=self.user, post=self.post),
+            lambda: self.post.tags.add(tag),
+            lambda: Tag.objects.filter(pk=tag.pk).first().save(),
+            lambda: self.category.save(),
+        ]
+        for change in changes:
+            self.client.get(self.list_url)
+            change()
+            self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'MISS')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.get(self.list_url)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_hit_and_miss_statistics(self):
+        post_response_cache.reset_stats()
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+
+        stats = post_response_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertAlmostEqual(stats['hit_ratio'], 2 / 3)
+
+
+class FileBackedPostResponseCacheTests(APITestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.settings_override = override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'responses': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': self.directory,
+                'OPTIONS': {'MAX_ENTRIES': 5, 'CULL_FREQUENCY': 2},
+            },
+        })
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        Post.objects.create(author=user, title="On disk", content="content", is_published=True)
+        self.list_url = reverse('blog:posts-list')
+
+    def test_hit_and_invalidation(self):
+        self.client.get(self.list_url)
+        self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'HIT')
+
+        post_response_cache.bump()
+        self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'MISS')
+
+    def test_entries_are_size_bounded(self):
+        for page_size in range(1, 15):
+            self.client.get(self.list_url, {'page_size': page_size})
+
+        cache_files = [name for name in os.listdir(self.directory) if name.endswith('.djcache')]
+        self.assertLessEqual(len(cache_files), 5 + 1)
@@ -0,0 +1,76 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from accounts.models import User
+from blog.models import Post, Comment, PostLike, CommentLike
+
+
+class SyncLikeCountsCommandTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.posts = [
+            Post.objects.create(author=self.user, title=f"Post {i}", content="content", is_published=True)
+            for i in range(3)
+        ]
+        self.comment = Comment.objects.create(post=self.posts[0], user=self.user, content="hi", is_approved=True)
+        PostLike.objects.create(user=self.user, post=self.posts[0])
+        CommentLike.objects.create(user=self.user, comment=self.comment)
+
+    def test_reconciles_drifted_counters(self):
+        Post.objects.filter(pk=self.posts[0].pk).update(likes_count=7)
+        Post.objects.filter(pk=self.posts[1].pk).update(likes_count=3)
+        Comment.objects.filter(pk=self.comment.pk).update(likes_count=0)
+
+        out = StringIO()
+        call_command('sync_like_counts', batch_size=2, stdout=out)
+
+        self.assertEqual(list(Post.objects.order_by('pk').values_list('likes_count', flat=True)), [1, 0, 0])
+        self.assertEqual(Comment.objects.get(pk=self.comment.pk).likes_count, 1)
+        self.assertIn('2 posts synced', out.getvalue())
+        self.assertIn('1 comments synced', out.getvalue())
+
+    def test_dry_run_does_not_write(self):
+        Post.objects.filter(pk=self.posts[0].pk).update(likes_count=7)
+
+        out = StringIO()
+        call_command('sync_like_counts', dry_run=True, stdout=out)
+
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).likes_count, 7)
+        self.assertIn('1 posts drifted', out.getvalue())
+
+    def test_rebuild_rewrites_every_counter(self):
+        out = StringIO()
+        call_command('sync_like_counts', rebuild=True, stdout=out)
+        self.assertIn('3 posts synced', out.getvalue())
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).likes_count, 1)
+
+
+class SyncCommentThreadsCommandTests(TestCase):
+
+    def test_recomputes_root_and_depth(self):
+        user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        post = Post.objects.create(author=user, title="Thread", content="content", is_published=True)
+        root = Comment.objects.create(post=post, user=user, content="root", is_approved=True)
+        reply = Comment.objects.create(post=post, user=user, parent=root, content="reply", is_approved=True)
+        Comment.objects.create(post=post, user=user, parent=reply, content="nested", is_approved=True)
+        Comment.objects.update(root=None, depth=0)
+
+        out = StringIO()
+        call_command('sync_comment_threads', batch_size=2, stdout=out)
+
+        self.assertEqual(
+            list(Comment.objects.order_by('pk').values_list('root_id', 'depth')),
+            [(None, 0), (root.pk, 1), (root.pk, 2)],
+        )
+        self.assertIn('2 comments synced', out.getvalue())
@@ -0,0 +1,105 @@
+import time
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post, Comment, Tag, PostLike
+
+
+class PostConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Validated", content="long content",
+                                        is_published=True)
+        self.url = reverse('blog:posts-detail', kwargs={'slug': self.post.slug})
+        # authenticated reads skip the response cache, so every request reaches the view
+        self.client.force_authenticate(user=self.user)
+
+    def test_validators_are_sent(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        # the ETag covers likes_count, which changes without touching updated_at
+        self.assertNotIn('Last-Modified', response)
+
+    def test_matching_etag_returns_304_without_content(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('content', queries.captured_queries[0]['sql'])
+
+    def test_if_modified_since_does_not_hide_a_new_like(self):
+        last_modified = http_date(time.time() + 60)
+        PostLike.objects.create(user=self.user, post=self.post)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['likes_count'], 1)
+
+    def test_sparse_fieldsets_get_their_own_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'fields': 'title'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ['title'])
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_like_and_retag_change_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        PostLike.objects.create(user=self.user, post=self.post)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        self.post.tags.add(Tag.objects.create(name="new"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tags'], ['new'])
+
+    def test_missing_post_is_404(self):
+        url = reverse('blog:posts-detail', kwargs={'slug': 'missing'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CommentListConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Thread", content="content", is_published=True)
+        self.comment = Comment.objects.create(post=self.post, user=self.user, content="first", is_approved=True)
+        self.url = reverse('blog:post_comments') + f'?post_slug={self.post.slug}'
+
+    def test_unchanged_thread_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_or_edited_comment_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        Comment.objects.create(post=self.post, user=self.user, content="second", is_approved=True)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        self.comment.content = "edited"
+        self.comment.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
@@ -0,0 +1,86 @@
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post
+from core import images
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(name='photo.jpg', size=(1000, 500)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANTS_SYNC=True)
+class ImageVariantTests(APITestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+
+    def test_upload_renders_webp_variants_without_upscaling(self):
+        post = Post.objects.create(author=self.user, title="Pic", content="c", image=make_image())
+        post.refresh_from_db()
+
+        self.assertEqual(post.image_variants['source'], post.image.name)
+        self.assertEqual(sorted(post.image_variants['widths'], key=int), ['320', '640'])
+        name = post.image_variants['widths']['320']
+        with post.image.storage.open(name) as variant, Image.open(variant) as image:
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size, (320, 160))
+
+    def test_serializers_expose_srcset(self):
+        post = Post.objects.create(author=self.user, title="Pic", content="c", image=make_image(), is_published=True)
+        profile = self.user.profile
+        profile.picture = make_image('avatar.png', size=(200, 200))
+        profile.save()
+
+        response = self.client.get(reverse('blog:posts-detail', kwargs={'slug': post.slug}))
+        self.assertEqual(set(response.data['image_srcset']), {'320w', '640w'})
+        self.assertTrue(response.data['image_srcset']['320w'].startswith('http://testserver/'))
+
+        response = self.client.get(reverse('accounts:profiles-detail', kwargs={'pk': profile.pk}))
+        self.assertEqual(set(response.data['picture_srcset']), {'200w'})
+
+    def test_backfill_renders_missing_variants(self):
+        post = Post.objects.create(author=self.user, title="Pic", content="c", image=make_image())
+        Post.objects.filter(pk=post.pk).update(image_variants={})
+
+        out = StringIO()
+        call_command('backfill_image_variants', '--workers', '1', stdout=out)
+
+        post.refresh_from_db()
+        self.assertIn('1 posts rendered', out.getvalue())
+        self.assertEqual(post.image_variants['source'], post.image.name)
+
+    def test_background_failures_are_logged(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        with mock.patch.object(images, '_executor', executor), \
+                mock.patch.object(images, 'process_variants', side_effect=OSError('cannot identify image file')), \
+                self.assertLogs('core.images', level='ERROR') as logs:
+            images.submit_variants(Post, 42, 'image', 'image_variants')
+            # done callbacks run on the worker thread, which shutdown() joins
+            executor.shutdown(wait=True)
+
+        self.assertIn('Rendering image variants of blog.Post 42 failed', logs.output[0])
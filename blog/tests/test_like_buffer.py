@@ -0,0 +1,141 @@
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.like_buffer import like_buffer
+from blog.models import Post, PostLike
+
+
+@override_settings(BLOG_LIKE_BUFFER_ENABLED=True, BLOG_LIKE_BUFFER_SIZE=100, BLOG_LIKE_BUFFER_INTERVAL=3600)
+class BufferedPostLikeTests(APITestCase):
+
+    def setUp(self):
+        self.addCleanup(like_buffer.flush)
+        self.users = [
+            User.objects.create_user(
+                phone=f"0912345678{i}",
+                email=f"user{i}@gmail.com",
+                username=f"user{i}",
+                password="testpassword"
+            )
+            for i in range(3)
+        ]
+        self.post = Post.objects.create(author=self.users[0], title="Viral", content="content", is_published=True)
+        self.url = reverse('blog:post_like', kwargs={'post_slug': self.post.slug})
+
+    def like_as(self, user, method='post'):
+        self.client.force_authenticate(user=user)
+        return getattr(self.client, method)(self.url)
+
+    def test_like_is_accepted_without_writing(self):
+        response = self.like_as(self.users[1])
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(PostLike.objects.exists())
+        self.assertEqual(len(like_buffer), 1)
+
+    def test_user_sees_own_pending_like(self):
+        self.like_as(self.users[1])
+
+        self.assertTrue(self.like_as(self.users[1], 'get').data['liked'])
+        self.assertFalse(self.like_as(self.users[2], 'get').data['liked'])
+        self.assertEqual(self.like_as(self.users[1]).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_flush_writes_batch_and_counters(self):
+        for user in self.users:
+            self.like_as(user)
+        PostLike.objects.create(user=self.users[0], post=Post.objects.create(
+            author=self.users[0], title="Other", content="c", is_published=True))
+
+        with self.assertNumQueries(6):
+            # post and user lookups, savepoint, one bulk insert, one counter update, release
+            self.assertEqual(like_buffer.flush(), 3)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 3)
+        self.assertEqual(PostLike.objects.filter(post=self.post).count(), 3)
+
+    def test_like_then_unlike_coalesces(self):
+        PostLike.objects.create(user=self.users[2], post=self.post)
+        self.like_as(self.users[1])
+        self.like_as(self.users[1], 'delete')
+        self.like_as(self.users[2], 'delete')
+        self.assertFalse(self.like_as(self.users[2], 'get').data['liked'])
+
+        like_buffer.flush()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertFalse(PostLike.objects.filter(post=self.post).exists())
+
+    def test_unlike_without_like_is_not_found(self):
+        response = self.like_as(self.users[1], 'delete')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_full_buffer_flushes(self):
+        with override_settings(BLOG_LIKE_BUFFER_SIZE=2):
+            self.like_as(self.users[1])
+            self.like_as(self.users[2])
+
+        self.assertEqual(len(like_buffer), 0)
+        self.assertEqual(PostLike.objects.filter(post=self.post).count(), 2)
+
+    def test_failed_flush_in_a_request_is_logged_and_kept(self):
+        with override_settings(BLOG_LIKE_BUFFER_SIZE=2), \
+                mock.patch('blog.like_buffer.write_intents', side_effect=DatabaseError('database is locked')), \
+                self.assertLogs('blog.like_buffer', level='ERROR'):
+            self.assertEqual(self.like_as(self.users[1]).status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(self.like_as(self.users[2]).status_code, status.HTTP_202_ACCEPTED)
+
+        self.assertEqual(len(like_buffer), 2)
+        like_buffer.flush()
+        self.assertEqual(PostLike.objects.filter(post=self.post).count(), 2)
+
+    def test_unlikes_of_several_posts_are_removed(self):
+        other = Post.objects.create(author=self.users[0], title="Other", content="c", is_published=True)
+        for post in (self.post, other):
+            PostLike.objects.create(user=self.users[1], post=post)
+            like_buffer.unlike(self.users[1].pk, post.pk)
+        PostLike.objects.create(user=self.users[2], post=other)
+
+        like_buffer.flush()
+
+        self.assertEqual(list(PostLike.objects.values_list('user_id', 'post_id')), [(self.users[2].pk, other.pk)])
+        other.refresh_from_db()
+        self.assertEqual(other.likes_count, 1)
+
+    def test_due_buffer_flushes_after_request(self):
+        with override_settings(BLOG_LIKE_BUFFER_INTERVAL=0):
+            self.like_as(self.users[1])
+
+        self.assertEqual(PostLike.objects.filter(post=self.post).count(), 1)
+
+
+@override_settings(BLOG_LIKE_BUFFER_ENABLED=True, BLOG_LIKE_BUFFER_SIZE=100, BLOG_LIKE_BUFFER_INTERVAL=3600)
+class BufferedLikeOnDeletedPostTests(TransactionTestCase):
+
+    def setUp(self):
+        self.addCleanup(like_buffer.flush)
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Kept", content="content", is_published=True)
+        self.gone = Post.objects.create(author=self.user, title="Gone", content="content", is_published=True)
+
+    def test_intents_for_deleted_posts_are_dropped(self):
+        like_buffer.like(self.user.pk, self.post.pk)
+        like_buffer.like(self.user.pk, self.gone.pk)
+        self.gone.delete()
+
+        self.assertEqual(like_buffer.flush(), 2)
+
+        self.assertEqual(len(like_buffer), 0)
+        self.assertEqual(list(PostLike.objects.values_list('post_id', flat=True)), [self.post.pk])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
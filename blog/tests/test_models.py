@@ -0,0 +1,79 @@
+from django.test import TestCase
+from accounts.models import User
+from blog.models import Post, Comment, PostLike, CommentLike, EXCERPT_LENGTH
+
+
+class LikeCounterTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            phone="09123456789",
+            email="author@gmail.com",
+            username="author",
+            password="testpassword"
+        )
+        self.reader = User.objects.create_user(
+            phone="09987654321",
+            email="reader@gmail.com",
+            username="reader",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.author, title="Counter post", content="content", is_published=True)
+        self.comment = Comment.objects.create(post=self.post, user=self.reader, content="nice", is_approved=True)
+
+    def test_post_like_increments_counter(self):
+        PostLike.objects.create(user=self.reader, post=self.post)
+        PostLike.objects.create(user=self.author, post=self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
+
+    def test_post_like_delete_decrements_counter(self):
+        like = PostLike.objects.create(user=self.reader, post=self.post)
+        like.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_comment_like_counter(self):
+        like = CommentLike.objects.create(user=self.author, comment=self.comment)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.likes_count, 1)
+
+        like.delete()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.likes_count, 0)
+
+    def test_counter_never_goes_negative(self):
+        like = PostLike.objects.create(user=self.reader, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=0)
+        like.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+
+class PostSummaryTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            phone="09123456789",
+            email="author@gmail.com",
+            username="author",
+            password="testpassword"
+        )
+
+    def test_excerpt_and_reading_time_computed_on_save(self):
+        post = Post.objects.create(author=self.author, title="Long", content="<p>word</p> " * 450)
+
+        self.assertEqual(post.reading_time, 3)
+        self.assertLessEqual(len(post.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(post.excerpt.startswith('word word'))
+        self.assertTrue(post.excerpt.endswith('…'))
+
+    def test_update_fields_with_content_refreshes_summary(self):
+        post = Post.objects.create(author=self.author, title="Short", content="one two")
+        post.content = "changed"
+        post.save(update_fields=['content'])
+
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, "changed")
+        self.assertEqual(post.reading_time, 1)
+
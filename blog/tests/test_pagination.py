@@ -0,0 +1,77 @@
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post, Comment
+
+
+class KeysetPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        Post.objects.bulk_create([
+            Post(author=self.user, title=f"Post {i}", slug=f"post-{i}", content="content", is_published=True)
+            for i in range(7)
+        ])
+        # three posts share a timestamp so the id tie-breaker is exercised
+        now = timezone.now()
+        for index, post in enumerate(Post.objects.order_by('id')):
+            Post.objects.filter(pk=post.pk).update(created_at=now - timedelta(minutes=min(index, 4)))
+        self.url = reverse('blog:posts-list')
+
+    def walk(self, url, key='next'):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles.extend(post['title'] for post in response.data['results'])
+            url = response.data[key]
+        return titles
+
+    def test_pages_cover_every_post_once_newest_first(self):
+        titles = self.walk(self.url + '?page_size=2')
+        expected = list(Post.objects.order_by('-created_at', '-id').values_list('title', flat=True))
+        self.assertEqual(titles, expected)
+
+    def test_previous_link_walks_back(self):
+        response = self.client.get(self.url + '?page_size=3')
+        second = self.client.get(response.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(back.data['results'], response.data['results'])
+        self.assertIsNone(back.data['previous'])
+
+    def test_no_offset_or_count_queries(self):
+        response = self.client.get(self.url + '?page_size=2')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data['next'])
+
+        sql = ' '.join(query['sql'] for query in queries.captured_queries).upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'bm90LWEtY3Vyc29y'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_roots_paginated_oldest_first(self):
+        post = Post.objects.first()
+        for i in range(5):
+            Comment.objects.create(post=post, user=self.user, content=f"comment {i}", is_approved=True)
+
+        url = reverse('blog:post_comments') + f'?post_slug={post.slug}&page_size=2'
+        contents = []
+        while url:
+            response = self.client.get(url)
+            contents.extend(comment['content'] for comment in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(contents, [f"comment {i}" for i in range(5)])
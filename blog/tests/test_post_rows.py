@@ -0,0 +1,50 @@
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from blog.models import Post, Category, Tag
+from blog.post_rows import post_rows, serialize_post_rows
+from blog.serializers import ReadOnlyPostSerializer
+
+
+class PostRowsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        category = Category.objects.create(name="Tech")
+        tags = [Tag.objects.create(name=name) for name in ("python", "django", "orm")]
+        for i in range(4):
+            post = Post.objects.create(
+                author=self.user, title=f"Post {i}", content="content", is_published=True,
+                category=category if i % 2 else None, image=f"blog/cover-{i}.jpg" if i % 2 else None,
+            )
+            post.tags.add(*reversed(tags[:i]))
+        Post.objects.filter(title="Post 1").update(image_variants={'source': 'blog/cover-1.jpg', 'widths': {'320': 'blog/variants/cover-1_320w.webp'}})
+        self.request = APIRequestFactory().get('/blog/posts/')
+        self.queryset = Post.objects.order_by('-created_at', '-id')
+
+    def test_matches_model_serializer(self):
+        expected = ReadOnlyPostSerializer(
+            self.queryset.select_related('author', 'category').prefetch_related('tags'),
+            many=True, context={'request': self.request}
+        ).data
+        with self.assertNumQueries(2):
+            rows = serialize_post_rows(post_rows(self.queryset), self.request)
+
+        self.assertEqual(json.dumps(rows), json.dumps(expected))
+
+    def test_without_request_urls_stay_relative(self):
+        expected = ReadOnlyPostSerializer(self.queryset, many=True).data
+        self.assertEqual(serialize_post_rows(post_rows(self.queryset)), expected)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_post_serializers', '--repeat', '1', stdout=out)
+        self.assertIn('speedup', out.getvalue())
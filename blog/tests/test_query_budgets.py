@@ -0,0 +1,119 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog import views
+from blog.models import Post, Comment, Category, Tag, PostTrendingScore
+from blog.slugs import slug_resolver
+from blog.taxonomy import taxonomy
+from relationships.models import Follow, Subscribe
+from relationships.entitlements import get_entitled_author_ids
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Fails when an endpoint issues more queries than its view's `query_budget`,
+    or when the number of queries changes as the number of rows grows.
+    """
+    row_counts = (1, 5, 20)
+
+    def assertWithinBudget(self, view_class, url, add_rows, **params):
+        budget = view_class.query_budget
+        self.assertIsNotNone(budget, f'{view_class.__name__} declares no query_budget')
+
+        counts = []
+        total = 0
+        for rows in self.row_counts:
+            add_rows(rows - total)
+            total = rows
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(queries))
+
+        self.assertLessEqual(max(counts), budget,
+                             f'{view_class.__name__} exceeded its budget of {budget} queries: {counts}')
+        self.assertEqual(len(set(counts)), 1,
+                         f'{view_class.__name__} query count grows with rows: {counts}')
+
+
+class BlogQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            phone="09123456789",
+            email="author@gmail.com",
+            username="author",
+            password="testpassword"
+        )
+        self.reader = User.objects.create_user(
+            phone="09987654321",
+            email="reader@gmail.com",
+            username="reader",
+            password="testpassword"
+        )
+        self.category = Category.objects.create(name="Tech")
+        self.tags = [Tag.objects.create(name="python"), Tag.objects.create(name="django")]
+
+    def add_posts(self, count, **kwargs):
+        for _ in range(count):
+            post = Post.objects.create(author=self.author, title="Post", content="content",
+                                       category=self.category, is_published=True, **kwargs)
+            post.tags.set(self.tags)
+        # tag counts changed; the taxonomy reload belongs to the first request after the write
+        taxonomy.snapshot()
+
+    def test_public_post_list(self):
+        self.assertWithinBudget(views.ReadOnlyPublicPostView, reverse('blog:posts-list'), self.add_posts)
+
+    def test_premium_post_list(self):
+        Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=1)
+        # entitlements are cached per user, so only the first request looks them up
+        get_entitled_author_ids(self.reader)
+        self.client.force_authenticate(user=self.reader)
+        self.assertWithinBudget(views.ReadOnlyPremiumPostView, reverse('blog:premium-posts-list'),
+                                lambda count: self.add_posts(count, is_premium=True))
+
+    @override_settings(TIMELINE_FANOUT_SYNC=True)
+    def test_timeline(self):
+        Follow.objects.create(author=self.author, follower=self.reader)
+        get_entitled_author_ids(self.reader)
+        self.client.force_authenticate(user=self.reader)
+        self.assertWithinBudget(views.TimelineView, reverse('blog:timeline'), self.add_posts)
+
+    def test_trending(self):
+        def add_scored_posts(count):
+            self.add_posts(count)
+            for post in Post.objects.filter(trending__isnull=True):
+                PostTrendingScore.objects.create(post=post, score=post.pk, updated_at=post.created_at)
+
+        self.assertWithinBudget(views.TrendingPostView, reverse('blog:posts-trending'), add_scored_posts)
+
+    def test_post_comments(self):
+        post = Post.objects.create(author=self.author, title="Thread", content="content", is_published=True)
+
+        def add_threads(count):
+            for _ in range(count):
+                root = Comment.objects.create(post=post, user=self.reader, content="root", is_approved=True)
+                Comment.objects.create(post=post, user=self.author, parent=root, content="reply", is_approved=True)
+
+        # the slug is resolved from the shared in-process cache after the first lookup
+        slug_resolver.resolve(post.slug)
+        self.assertWithinBudget(views.ListCommentsView, reverse('blog:post_comments'), add_threads,
+                                post_slug=post.slug)
+
+    def test_post_comments_deep_thread(self):
+        post = Post.objects.create(author=self.author, title="Thread", content="content", is_published=True)
+        deepest = [Comment.objects.create(post=post, user=self.reader, content="root", is_approved=True)]
+
+        def deepen_thread(count):
+            for _ in range(count):
+                deepest[0] = Comment.objects.create(post=post, user=self.author, parent=deepest[0],
+                                                    content="reply", is_approved=True)
+
+        slug_resolver.resolve(post.slug)
+        self.assertWithinBudget(views.ListCommentsView, reverse('blog:post_comments'), deepen_thread,
+                                post_slug=post.slug)
@@ -0,0 +1,118 @@
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog import search
+from blog.models import Post, Tag, SearchTerm
+
+
+class SearchPostViewTests(APITestCase):
+    backend = None
+
+    def setUp(self):
+        if self.backend is not None:
+            patcher = mock.patch.object(search, '_backend', self.backend)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.author = User.objects.create_user(
+            phone="09123456789",
+            email="writer@gmail.com",
+            username="writer",
+            password="testpassword"
+        )
+        self.title_match = Post.objects.create(author=self.author, title="Django performance",
+                                               content="notes", is_published=True)
+        self.content_match = Post.objects.create(author=self.author, title="Weekly notes",
+                                                 content="a paragraph about django", is_published=True)
+        self.tagged = Post.objects.create(author=self.author, title="Tagged", content="text", is_published=True)
+        self.tagged.tags.add(Tag.objects.create(name="caching"))
+        Post.objects.create(author=self.author, title="Django draft", content="draft")
+        Post.objects.create(author=self.author, title="Django premium", content="paid", is_published=True, is_premium=True)
+        self.url = reverse('blog:posts-search')
+
+    def titles(self, query):
+        response = self.client.get(self.url, {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['title'] for post in response.data]
+
+    def test_title_ranks_above_content(self):
+        self.assertEqual(self.titles('django'), ['Django performance', 'Weekly notes'])
+
+    def test_matches_tags_and_author(self):
+        self.assertEqual(self.titles('caching'), ['Tagged'])
+        self.assertEqual(len(self.titles('writer')), 3)
+
+    def test_query_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_limit(self):
+        response = self.client.get(self.url, {'q': 'django', 'limit': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_punctuation_is_ignored(self):
+        self.assertEqual(self.titles('"django" OR -'), ['Django performance', 'Weekly notes'])
+
+    def test_premium_posts_do_not_crowd_out_the_limit(self):
+        for i in range(5):
+            Post.objects.create(author=self.author, title=f"Django premium {i}", content="django django",
+                                is_published=True, is_premium=True)
+
+        response = self.client.get(self.url, {'q': 'django', 'limit': 2})
+        self.assertEqual([post['title'] for post in response.data], ['Django performance', 'Weekly notes'])
+
+    def test_index_follows_premium_changes(self):
+        self.title_match.is_premium = True
+        self.title_match.save()
+        self.assertEqual(self.titles('django'), ['Weekly notes'])
+
+        self.title_match.is_premium = False
+        self.title_match.save()
+        self.assertEqual(self.titles('django'), ['Django performance', 'Weekly notes'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.title_match.title = "Flask performance"
+        self.title_match.save()
+        self.assertEqual(self.titles('flask'), ['Flask performance'])
+
+        self.content_match.is_published = False
+        self.content_match.save()
+        self.assertEqual(self.titles('django'), [])
+
+        self.title_match.delete()
+        self.assertEqual(self.titles('flask'), [])
+
+    def test_index_follows_tag_changes(self):
+        self.tagged.tags.clear()
+        self.assertEqual(self.titles('caching'), [])
+
+        tag = Tag.objects.create(name="speed")
+        tag.posts.add(self.title_match)
+        self.assertEqual(self.titles('speed'), ['Django performance'])
+
+        tag.name = "latency"
+        tag.save()
+        self.assertEqual(self.titles('latency'), ['Django performance'])
+
+    def test_rebuild_command(self):
+        search.get_search_backend().clear()
+        self.assertEqual(self.titles('django'), [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', batch_size=2, stdout=out)
+
+        self.assertIn('3 posts indexed', out.getvalue())
+        self.assertEqual(self.titles('django'), ['Django performance', 'Weekly notes'])
+
+
+class InvertedIndexSearchPostViewTests(SearchPostViewTests):
+    backend = search.InvertedIndexSearchBackend()
+
+    def test_postings_are_stored(self):
+        self.assertTrue(SearchTerm.objects.filter(term='django', post=self.title_match).exists())
+        self.assertFalse(SearchTerm.objects.filter(term='draft').exists())
+        self.assertFalse(SearchTerm.objects.filter(term='paid').exists())
@@ -0,0 +1,79 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post
+from blog.serializers import UserPostSerilaizer
+from blog.slugs import SlugResolver, slug_resolver
+
+
+class SlugResolverTests(APITestCase):
+
+    def setUp(self):
+        slug_resolver.clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Resolved", content="content", is_published=True)
+
+    def test_resolves_and_counts_hits(self):
+        ref = slug_resolver.resolve(self.post.slug)
+        with self.assertNumQueries(0):
+            self.assertEqual(slug_resolver.resolve(self.post.slug), ref)
+
+        self.assertEqual(ref.id, self.post.id)
+        self.assertEqual(ref.author_id, self.user.id)
+        self.assertTrue(ref.is_published)
+        self.assertEqual(slug_resolver.stats()['hit_ratio'], 0.5)
+
+    def test_unknown_slug(self):
+        self.assertIsNone(slug_resolver.resolve('missing'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        resolver = SlugResolver(maxsize=2)
+        posts = [Post.objects.create(author=self.user, title=f"Post {i}", content="c") for i in range(3)]
+        resolver.resolve(posts[0].slug)
+        resolver.resolve(posts[1].slug)
+        resolver.resolve(posts[0].slug)
+        resolver.resolve(posts[2].slug)
+
+        self.assertEqual(resolver.stats()['size'], 2)
+        with self.assertNumQueries(1):
+            resolver.resolve(posts[1].slug)
+
+    def test_slug_regeneration_invalidates(self):
+        old_slug = self.post.slug
+        slug_resolver.resolve(old_slug)
+
+        serializer = UserPostSerilaizer(instance=self.post, data={'title': 'Renamed'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.assertIsNone(slug_resolver.resolve(old_slug))
+        self.assertEqual(slug_resolver.resolve(self.post.slug).id, self.post.id)
+
+    def test_delete_invalidates(self):
+        slug = self.post.slug
+        slug_resolver.resolve(slug)
+        self.post.delete()
+        self.assertIsNone(slug_resolver.resolve(slug))
+
+    def test_views_share_the_resolver(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('blog:posts-detail', kwargs={'slug': self.post.slug}))
+        self.client.get(reverse('blog:post_like', kwargs={'post_slug': self.post.slug}))
+        self.client.get(reverse('blog:post_comments'), {'post_slug': self.post.slug})
+
+        self.assertEqual(slug_resolver.stats()['misses'], 1)
+        self.assertGreaterEqual(slug_resolver.stats()['hits'], 2)
+
+    def test_unpublished_post_is_rejected_without_loading_it(self):
+        draft = Post.objects.create(author=self.user, title="Draft", content="content")
+        slug_resolver.resolve(draft.slug)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('blog:posts-detail', kwargs={'slug': draft.slug}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
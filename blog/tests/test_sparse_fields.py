@@ -0,0 +1,62 @@
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post
+
+
+class SparseFieldsetTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Post", content="body " * 300, is_published=True)
+        self.list_url = reverse('blog:posts-list')
+        self.detail_url = reverse('blog:posts-detail', kwargs={'slug': self.post.slug})
+
+    def test_fields_selects_and_orders_like_the_serializer(self):
+        response = self.client.get(self.list_url, {'fields': 'reading_time,title,excerpt'})
+
+        self.assertEqual(list(response.data['results'][0]), ['title', 'excerpt', 'reading_time'])
+        self.assertEqual(response.data['results'][0]['reading_time'], 2)
+
+    def test_exclude_skips_content_column(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'exclude': 'content'})
+
+        self.assertNotIn('content', response.data['results'][0])
+        self.assertIn('excerpt', response.data['results'][0])
+        self.assertFalse(any('"blog_post"."content"' in query['sql'] for query in queries))
+
+    def test_detail_defers_unselected_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, {'fields': 'title,tags'})
+
+        self.assertEqual(response.data, {'title': 'Post', 'tags': []})
+        self.assertFalse(any('"blog_post"."content"' in query['sql'] for query in queries))
+
+    def test_streamed_list_honours_fields(self):
+        response = self.client.get(self.list_url, {'stream': '1', 'fields': 'slug'})
+        self.assertEqual(b''.join(response.streaming_content), f'[{{"slug":"{self.post.slug}"}}]'.encode())
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.list_url, {'fields': 'title,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_refresh_post_summaries_command(self):
+        Post.objects.filter(pk=self.post.pk).update(excerpt='', reading_time=0)
+        out = StringIO()
+        call_command('refresh_post_summaries', stdout=out)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.reading_time, 2)
+        self.assertIn('1 posts refreshed', out.getvalue())
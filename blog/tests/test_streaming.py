@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post, Tag
+
+
+class StreamingPostListTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        tag = Tag.objects.create(name="django")
+        for i in range(7):
+            post = Post.objects.create(
+                author=self.user, title=f"Post {i}", content="café\u2028line", is_published=True
+            )
+            post.tags.add(tag)
+        Post.objects.create(author=self.user, title="Draft", content="c", is_published=False)
+        self.url = reverse('blog:posts-list')
+
+    def test_stream_is_byte_compatible_with_rendered_list(self):
+        paginated = self.client.get(self.url, {'page_size': 100})
+        streamed = self.client.get(self.url, {'stream': '1'})
+
+        self.assertEqual(streamed.status_code, 200)
+        self.assertEqual(b''.join(streamed.streaming_content), JSONRenderer().render(paginated.data['results']))
+
+    def test_stream_reads_rows_in_chunks(self):
+        response = self.client.get(self.url, {'stream': '1'})
+        with self.assertNumQueries(2):
+            body = b''.join(response.streaming_content)
+        self.assertTrue(body.startswith(b'[{') and body.endswith(b'}]'))
+
+    def test_empty_stream(self):
+        Post.objects.all().delete()
+        response = self.client.get(self.url, {'stream': '1'})
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+    def test_stream_is_not_cached(self):
+        self.client.get(self.url, {'stream': '1'})
+        response = self.client.get(self.url, {'stream': '1'})
+        self.assertTrue(response.streaming)
+        self.assertNotIn('X-Cache', response)
@@ -0,0 +1,143 @@
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post, Category, Tag
+from blog.post_rows import tag_names
+from blog.serializers import ReadOnlyPostSerializer
+from blog.taxonomy import taxonomy
+
+
+class TaxonomyCountTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        taxonomy.clear()
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.tech = Category.objects.create(name="Tech")
+        self.life = Category.objects.create(name="Life")
+        self.python = Tag.objects.create(name="python")
+        self.django = Tag.objects.create(name="django")
+
+    def counts(self):
+        return (
+            dict(Category.objects.values_list('name', 'post_count')),
+            dict(Tag.objects.values_list('name', 'post_count')),
+        )
+
+    def test_publishing_and_unpublishing(self):
+        post = Post.objects.create(author=self.user, title="Draft", content="c", category=self.tech)
+        post.tags.add(self.python, self.django)
+        self.assertEqual(self.counts(), ({'Tech': 0, 'Life': 0}, {'python': 0, 'django': 0}))
+
+        post.is_published = True
+        post.save()
+        self.assertEqual(self.counts(), ({'Tech': 1, 'Life': 0}, {'python': 1, 'django': 1}))
+
+        post.category = self.life
+        post.save()
+        self.assertEqual(self.counts()[0], {'Tech': 0, 'Life': 1})
+
+        post.is_published = False
+        post.save()
+        self.assertEqual(self.counts(), ({'Tech': 0, 'Life': 0}, {'python': 0, 'django': 0}))
+
+    def test_tag_changes_on_published_posts(self):
+        post = Post.objects.create(author=self.user, title="Post", content="c", is_published=True)
+        post.tags.add(self.python)
+        post.tags.remove(self.python, self.django)
+        self.assertEqual(self.counts()[1], {'python': 0, 'django': 0})
+
+        post.tags.set([self.python, self.django])
+        post.tags.clear()
+        self.assertEqual(self.counts()[1], {'python': 0, 'django': 0})
+
+        self.django.posts.add(post)
+        self.assertEqual(self.counts()[1], {'python': 0, 'django': 1})
+        self.django.posts.clear()
+        self.assertEqual(self.counts()[1], {'python': 0, 'django': 0})
+
+    def test_deleting_a_published_post(self):
+        post = Post.objects.create(author=self.user, title="Post", content="c", category=self.tech, is_published=True)
+        post.tags.add(self.python)
+        post.delete()
+        self.assertEqual(self.counts(), ({'Tech': 0, 'Life': 0}, {'python': 0, 'django': 0}))
+
+    def test_sync_command_repairs_drift(self):
+        post = Post.objects.create(author=self.user, title="Post", content="c", category=self.tech, is_published=True)
+        post.tags.add(self.python)
+        Category.objects.update(post_count=5)
+        Tag.objects.update(post_count=0)
+
+        out = StringIO()
+        call_command('sync_taxonomy_counts', stdout=out)
+        self.assertEqual(self.counts(), ({'Tech': 1, 'Life': 0}, {'python': 1, 'django': 0}))
+        self.assertIn('2 categories and 1 tags synced', out.getvalue())
+
+    def test_serializing_category_needs_no_query(self):
+        post = Post.objects.create(author=self.user, title="Post", content="c", category=self.tech, is_published=True)
+        taxonomy.snapshot()
+        post = Post.objects.prefetch_related('tags').select_related('author').get(pk=post.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(ReadOnlyPostSerializer(post).data['category'], 'Tech')
+
+        self.tech.name = "Technology"
+        self.tech.save()
+        self.assertEqual(ReadOnlyPostSerializer(post).data['category'], 'Technology')
+
+    def test_taxa_unknown_to_the_snapshot_are_reloaded(self):
+        taxonomy.snapshot()
+        # created by another process: no signal, no version bump here
+        Category.objects.bulk_create([Category(name="News", slug="news")])
+        Post.tags.through.objects.bulk_create([Post.tags.through(
+            post=Post.objects.create(author=self.user, title="Post", content="c", is_published=True),
+            tag=Tag.objects.bulk_create([Tag(name="rust")])[0],
+        )])
+        news = Category.objects.get(name="News")
+
+        self.assertEqual(taxonomy.category(news.pk).name, "News")
+        self.assertEqual(list(tag_names(Post.objects.values_list('pk', flat=True)).values()), [['rust']])
+
+    def test_snapshot_expires(self):
+        taxonomy.snapshot()
+        Category.objects.filter(pk=self.tech.pk).update(name="Technology")
+        self.assertEqual(taxonomy.category(self.tech.pk).name, "Tech")
+
+        taxonomy._loaded_at -= taxonomy.max_age
+        self.assertEqual(taxonomy.category(self.tech.pk).name, "Technology")
+
+
+class TaxonomyViewTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        taxonomy.clear()
+        user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        tech = Category.objects.create(name="Tech")
+        tags = [Tag.objects.create(name=name) for name in ("python", "django", "unused")]
+        for i in range(3):
+            post = Post.objects.create(author=user, title=f"Post {i}", content="c", category=tech, is_published=True)
+            post.tags.add(*tags[:1 if i else 2])
+
+    def test_categories(self):
+        response = self.client.get(reverse('blog:categories'))
+        self.assertEqual(response.data, [{'name': 'Tech', 'slug': 'tech', 'post_count': 3}])
+
+    def test_tag_cloud_is_served_from_memory(self):
+        self.client.get(reverse('blog:tags'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('blog:tags'))
+        self.assertEqual(response.data, [{'name': 'python', 'post_count': 3}, {'name': 'django', 'post_count': 1}])
@@ -0,0 +1,113 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.tests import make_user
+from blog import timeline
+from blog.models import Post, TimelineEntry
+from relationships.models import Follow, Subscribe
+
+
+@override_settings(TIMELINE_FANOUT_SYNC=True)
+class TimelineTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.author = make_user(1)
+        self.stranger = make_user(2)
+        Follow.objects.create(author=self.author, follower=self.reader)
+        self.url = reverse('blog:timeline')
+        self.client.force_authenticate(user=self.reader)
+
+    def publish(self, author, title, **kwargs):
+        return Post.objects.create(author=author, title=title, content="content", is_published=True, **kwargs)
+
+    def titles(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['title'] for post in response.data['results']]
+
+    def test_publishing_fans_out_to_followers(self):
+        post = self.publish(self.author, "Fresh")
+        self.publish(self.stranger, "Unrelated")
+
+        self.assertTrue(TimelineEntry.objects.filter(user=self.reader, post=post).exists())
+        self.assertEqual(self.titles(), ['Fresh'])
+
+    def test_drafts_wait_until_published(self):
+        draft = Post.objects.create(author=self.author, title="Draft", content="content")
+        self.assertEqual(self.titles(), [])
+
+        draft.is_published = True
+        draft.save()
+        self.assertEqual(self.titles(), ['Draft'])
+
+        draft.is_published = False
+        draft.save()
+        self.assertFalse(TimelineEntry.objects.filter(post=draft).exists())
+
+    def test_follow_backfills_and_unfollow_removes(self):
+        self.publish(self.stranger, "Older")
+        follow = Follow.objects.create(author=self.stranger, follower=self.reader)
+        self.assertEqual(self.titles(), ['Older'])
+
+        follow.delete()
+        self.assertEqual(self.titles(), [])
+
+    def test_timeline_is_trimmed(self):
+        with mock.patch.object(timeline, 'TIMELINE_LENGTH', 3):
+            for i in range(5):
+                self.publish(self.author, f"Post {i}")
+
+        self.assertEqual(TimelineEntry.objects.filter(user=self.reader).count(), 3)
+        self.assertEqual(self.titles(), ['Post 4', 'Post 3', 'Post 2'])
+
+    def test_high_fanout_authors_are_merged_at_read_time(self):
+        with mock.patch.object(timeline, 'FANOUT_FOLLOWER_LIMIT', 1):
+            cache.clear()
+            self.publish(self.author, "Celebrity post")
+            self.assertFalse(TimelineEntry.objects.exists())
+            self.assertEqual(self.titles(), ['Celebrity post'])
+
+    def test_premium_posts_need_subscription(self):
+        self.publish(self.author, "Paid", is_premium=True)
+        self.assertEqual(self.titles(), [])
+
+        Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=1)
+        self.assertEqual(self.titles(), ['Paid'])
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class DeferredFanOutTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.author = make_user(1)
+        Follow.objects.create(author=self.author, follower=self.reader)
+
+    def test_fan_out_waits_for_commit_and_runs_on_the_pool(self):
+        with mock.patch.object(timeline, 'submit_fan_out') as submit, \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            post = Post.objects.create(author=self.author, title="Later", content="content", is_published=True)
+            submit.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        submit.assert_called_once_with(post.pk)
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_unpublished_posts_are_not_fanned_out(self):
+        with self.captureOnCommitCallbacks():
+            post = Post.objects.create(author=self.author, title="Gone", content="content", is_published=True)
+        Post.objects.filter(pk=post.pk).update(is_published=False)
+
+        with override_settings(TIMELINE_FANOUT_SYNC=True):
+            timeline.fan_out_post(post.pk)
+        self.assertFalse(TimelineEntry.objects.exists())
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from accounts.tests import make_user
+from blog.models import Post, PostLike, Comment, PostTrendingScore
+from blog.trending import update_trending_scores
+
+
+def make_users(count):
+    return [make_user(i) for i in range(count)]
+
+
+class TrendingScoreTests(TestCase):
+
+    def setUp(self):
+        self.users = make_users(4)
+        self.old = Post.objects.create(author=self.users[0], title="Old", content="c", is_published=True)
+        self.new = Post.objects.create(author=self.users[0], title="New", content="c", is_published=True)
+        self.now = timezone.now()
+
+    def like(self, user, post, hours_ago):
+        like = PostLike.objects.create(user=user, post=post)
+        PostLike.objects.filter(pk=like.pk).update(created_at=self.now - timedelta(hours=hours_ago))
+
+    def test_recent_activity_outranks_older_activity(self):
+        for user in self.users[:3]:
+            self.like(user, self.old, hours_ago=72)
+        self.like(self.users[0], self.new, hours_ago=1)
+
+        self.assertEqual(update_trending_scores(until=self.now), 2)
+        scores = dict(PostTrendingScore.objects.values_list('post_id', 'score'))
+        self.assertGreater(scores[self.new.pk], scores[self.old.pk])
+
+    def test_incremental_run_only_rescans_new_activity(self):
+        self.like(self.users[0], self.old, hours_ago=5)
+        self.like(self.users[1], self.new, hours_ago=5)
+        update_trending_scores(until=self.now - timedelta(hours=1))
+        before = dict(PostTrendingScore.objects.values_list('post_id', 'score'))
+
+        self.like(self.users[2], self.new, hours_ago=0)
+        Comment.objects.create(post=self.new, user=self.users[3], content="hi", is_approved=True)
+        self.assertEqual(update_trending_scores(until=self.now + timedelta(minutes=1)), 1)
+
+        after = dict(PostTrendingScore.objects.values_list('post_id', 'score'))
+        self.assertEqual(after[self.old.pk], before[self.old.pk])
+        self.assertGreater(after[self.new.pk], before[self.new.pk])
+
+    def test_incremental_matches_full_rebuild(self):
+        self.like(self.users[0], self.new, hours_ago=10)
+        update_trending_scores(until=self.now - timedelta(hours=5))
+        self.like(self.users[1], self.new, hours_ago=2)
+        update_trending_scores(until=self.now)
+        incremental = PostTrendingScore.objects.get(post=self.new).score
+
+        update_trending_scores(until=self.now, full=True)
+        self.assertAlmostEqual(PostTrendingScore.objects.get(post=self.new).score, incremental)
+
+    def test_command(self):
+        self.like(self.users[0], self.new, hours_ago=1)
+        out = StringIO()
+        call_command('update_trending_scores', stdout=out)
+        self.assertIn('1 posts rescored', out.getvalue())
+
+
+class TrendingViewTests(APITestCase):
+
+    def setUp(self):
+        self.users = make_users(3)
+        self.posts = [
+            Post.objects.create(author=self.users[0], title=f"Post {i}", content="c", is_published=True)
+            for i in range(3)
+        ]
+        Post.objects.create(author=self.users[0], title="Premium", content="c", is_published=True, is_premium=True)
+        for i, post in enumerate(self.posts):
+            for user in self.users[:i + 1]:
+                PostLike.objects.create(user=user, post=post)
+        PostLike.objects.create(user=self.users[0], post=Post.objects.get(title="Premium"))
+        update_trending_scores()
+        self.url = reverse('blog:posts-trending')
+
+    def test_lists_published_posts_by_score_with_cursor(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual([post['title'] for post in response.data['results']], ['Post 2', 'Post 1'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([post['title'] for post in response.data['results']], ['Post 0'])
+        self.assertIsNone(response.data['next'])
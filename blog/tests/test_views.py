@@ -0,0 +1,167 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from blog.models import Post, Comment, PostLike
+from blog.slugs import slug_resolver
+
+
+class PostLikeViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Liked post", content="content", is_published=True)
+        self.url = reverse('blog:post_like', kwargs={'post_slug': self.post.slug})
+        self.client.force_authenticate(user=self.user)
+
+    def test_like_updates_counter(self):
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_double_like_rejected(self):
+        self.client.post(self.url)
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_unlike_updates_counter(self):
+        self.client.post(self.url)
+        response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+
+class CommentLikeViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        post = Post.objects.create(author=self.user, title="Post", content="content", is_published=True)
+        self.comment = Comment.objects.create(post=post, user=self.user, content="hi", is_approved=True)
+        self.url = reverse('blog:comment_like', kwargs={'comment_id': self.comment.id})
+        self.client.force_authenticate(user=self.user)
+
+    def test_like_and_unlike_update_counter(self):
+        self.client.post(self.url)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.likes_count, 1)
+
+        self.client.delete(self.url)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.likes_count, 0)
+
+
+class ReadOnlyPublicPostViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Public post", content="content", is_published=True)
+        Post.objects.create(author=self.user, title="Draft", content="content")
+        Post.objects.create(author=self.user, title="Premium", content="content", is_published=True, is_premium=True)
+        PostLike.objects.create(user=self.user, post=self.post)
+        self.list_url = reverse('blog:posts-list')
+
+    def test_list_only_public_posts(self):
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([post['title'] for post in response.data['results']], ['Public post'])
+        self.assertEqual(response.data['results'][0]['likes_count'], 1)
+
+    def test_likes_count_reads_no_like_rows(self):
+        with self.assertNumQueries(2):
+            # posts joined to authors, then tags; no COUNT over likes
+            self.client.get(self.list_url)
+
+    def test_retrieve_by_slug(self):
+        response = self.client.get(reverse('blog:posts-detail', kwargs={'slug': self.post.slug}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['likes_count'], 1)
+
+
+class ListCommentsViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="09123456789",
+            email="test@gmail.com",
+            username="testuser",
+            password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.user, title="Thread", content="content", is_published=True)
+        self.root = Comment.objects.create(post=self.post, user=self.user, content="root", is_approved=True)
+        parent = self.root
+        for depth in range(1, 6):
+            parent = Comment.objects.create(post=self.post, user=self.user, parent=parent,
+                                            content=f"reply {depth}", is_approved=True)
+        Comment.objects.create(post=self.post, user=self.user, parent=self.root, content="second", is_approved=True)
+        Comment.objects.create(post=self.post, user=self.user, parent=self.root, content="hidden")
+        self.url = reverse('blog:post_comments')
+
+    def test_post_slug_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nested_response_shape(self):
+        response = self.client.get(self.url, {'post_slug': self.post.slug})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        root = response.data['results'][0]
+        self.assertEqual(set(root), {'post', 'user', 'content', 'created_at', 'comments', 'is_approved', 'likes_count'})
+        self.assertEqual(root['post'], 'Thread')
+        self.assertEqual([reply['content'] for reply in root['comments']], ['reply 1', 'second'])
+        self.assertEqual(root['comments'][0]['comments'][0]['content'], 'reply 2')
+
+    def test_thread_queries_do_not_grow_with_depth(self):
+        slug_resolver.resolve(self.post.slug)
+        for i in range(10):
+            Comment.objects.create(post=self.post, user=self.user, content=f"root {i}", is_approved=True)
+
+        # post with comment summary, root page, then all replies of the page's threads
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'post_slug': self.post.slug})
+
+        replies = response.data['results'][0]['comments']
+        for depth in range(1, 6):
+            self.assertEqual(replies[0]['content'], f'reply {depth}')
+            replies = replies[0]['comments']
+        self.assertEqual(replies, [])
+
+    def test_replies_store_their_thread(self):
+        deepest = Comment.objects.get(content='reply 5')
+        self.assertEqual((deepest.root_id, deepest.depth), (self.root.pk, 5))
+        self.assertEqual((self.root.root_id, self.root.depth), (None, 0))
+
+    def test_max_depth_and_max_replies(self):
+        response = self.client.get(self.url, {'post_slug': self.post.slug, 'max_depth': 1, 'max_replies': 1})
+
+        replies = response.data['results'][0]['comments']
+        self.assertEqual([reply['content'] for reply in replies], ['reply 1'])
+        self.assertEqual(replies[0]['comments'], [])
+
+    def test_invalid_limit_rejected(self):
+        response = self.client.get(self.url, {'post_slug': self.post.slug, 'max_depth': '-1'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
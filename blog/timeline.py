@@ -0,0 +1,147 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from accounts.models import User
+from relationships.models import Follow
+from relationships.entitlements import get_entitled_author_ids
+from .models import Post, TimelineEntry
+
+
+# Entries kept per user; older ones are trimmed on every write.
+TIMELINE_LENGTH = 500
+# Authors with at least this many followers are merged at read time instead of fanned out.
+FANOUT_FOLLOWER_LIMIT = 5000
+# Recent posts copied into a timeline when a follow starts.
+BACKFILL_SIZE = 50
+FANOUT_BATCH_SIZE = 1000
+CELEBRITIES_CACHE_KEY = 'blog:timeline:celebrities'
+CELEBRITIES_TTL = 60 * 5
+
+logger = logging.getLogger(__name__)
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'TIMELINE_FANOUT_WORKERS', 1),
+            thread_name_prefix='timeline-fanout',
+        )
+    return _executor
+
+
+def celebrity_author_ids():
+    authors = cache.get(CELEBRITIES_CACHE_KEY)
+    if authors is None:
+        authors = frozenset(
+            User.objects.filter(followers_count__gte=FANOUT_FOLLOWER_LIMIT).values_list('pk', flat=True)
+        )
+        cache.set(CELEBRITIES_CACHE_KEY, authors, timeout=CELEBRITIES_TTL)
+    return authors
+
+
+def trim_timelines(user_ids):
+    ranked = (
+        TimelineEntry.objects.filter(user_id__in=user_ids)
+        .annotate(position=Window(RowNumber(), partition_by=F('user_id'), order_by=[F('created_at').desc(), F('post_id').desc()]))
+        .filter(position__gt=TIMELINE_LENGTH)
+        .values_list('pk', flat=True)
+    )
+    overflow = list(ranked)
+    if overflow:
+        TimelineEntry.objects.filter(pk__in=overflow).delete()
+
+
+def fan_out_post(post_id):
+    """Push a published post into the timelines of its author's followers."""
+    try:
+        post = Post.objects.filter(pk=post_id, is_published=True).only('pk', 'author_id', 'created_at').first()
+        if post is None or post.author_id in celebrity_author_ids():
+            return
+        followers = Follow.objects.filter(author_id=post.author_id).order_by('follower_id').values_list('follower_id', flat=True)
+        last_follower = 0
+        while True:
+            batch = list(followers.filter(follower_id__gt=last_follower)[:FANOUT_BATCH_SIZE])
+            if not batch:
+                return
+            TimelineEntry.objects.bulk_create(
+                [TimelineEntry(user_id=user_id, post=post, created_at=post.created_at) for user_id in batch],
+                ignore_conflicts=True,
+            )
+            trim_timelines(batch)
+            last_follower = batch[-1]
+    finally:
+        if not getattr(settings, 'TIMELINE_FANOUT_SYNC', False):
+            connections.close_all()
+
+
+def schedule_fan_out(post):
+    """
+    Fan a newly published post out on the local worker pool once the
+    transaction commits, so the publishing request does not wait for it.
+    With TIMELINE_FANOUT_SYNC (tests) it runs inline instead.
+    """
+    if getattr(settings, 'TIMELINE_FANOUT_SYNC', False):
+        fan_out_post(post.pk)
+    else:
+        transaction.on_commit(lambda: submit_fan_out(post.pk))
+
+
+def submit_fan_out(post_id):
+    future = get_executor().submit(fan_out_post, post_id)
+
+    def log_failure(future):
+        if future.exception() is not None:
+            logger.error('Fanning out post %s failed', post_id, exc_info=future.exception())
+
+    future.add_done_callback(log_failure)
+    return future
+
+
+def retract_post(post):
+    TimelineEntry.objects.filter(post=post).delete()
+
+
+def backfill_timeline(follower_id, author_ids):
+    """Copy the recent posts of newly followed authors into the follower's timeline, in one read."""
+    celebrities = celebrity_author_ids()
+    author_ids = [author_id for author_id in author_ids if author_id not in celebrities]
+    if not author_ids:
+        return
+    recent = (
+        Post.objects.filter(author_id__in=author_ids, is_published=True)
+        .annotate(position=Window(RowNumber(), partition_by=F('author_id'), order_by=[F('created_at').desc(), F('id').desc()]))
+        .filter(position__lte=BACKFILL_SIZE)
+        .values_list('id', 'created_at')
+    )
+    entries = [TimelineEntry(user_id=follower_id, post_id=post_id, created_at=created_at) for post_id, created_at in recent]
+    if entries:
+        TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        trim_timelines([follower_id])
+
+
+def remove_author_from_timeline(follower_id, author_id):
+    TimelineEntry.objects.filter(user_id=follower_id, post__author_id=author_id).delete()
+
+
+def timeline_queryset(user):
+    """
+    Published posts in the user's materialized timeline, merged with the posts of
+    followed high-fanout authors. Premium posts need an active subscription.
+    """
+    condition = Q(id__in=TimelineEntry.objects.filter(user=user).values('post_id'))
+    celebrities = celebrity_author_ids()
+    if celebrities:
+        followed = Follow.objects.filter(follower=user, author_id__in=celebrities).values_list('author_id', flat=True)
+        condition |= Q(author_id__in=list(followed))
+
+    visible = Q(is_premium=False)
+    entitled = get_entitled_author_ids(user)
+    if entitled:
+        visible |= Q(author_id__in=entitled)
+    return Post.objects.filter(condition, visible, is_published=True)
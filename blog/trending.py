@@ -0,0 +1,93 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Count, Max
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from .models import Post, PostLike, Comment, PostTrendingScore
+
+
+# A like or comment loses half its weight every HALF_LIFE.
+HALF_LIFE = timedelta(hours=getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24))
+# Activity older than this is ignored by a full rebuild, and scores not touched for as long are pruned.
+WINDOW = timedelta(days=7)
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+BATCH_SIZE = 500
+
+
+def decay_exponent(moment):
+    """log of the weight an event at `moment` carries relative to one at EPOCH."""
+    return math.log(2) * ((moment - EPOCH) / HALF_LIFE)
+
+
+def logaddexp(a, b):
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+def activity_buckets(since, until):
+    """
+    Yield (post_id, log weight) per post and hour of the likes and approved
+    comments created in (since, until], aggregated by the database.
+    """
+    sources = (
+        (PostLike.objects.all(), LIKE_WEIGHT),
+        (Comment.objects.filter(is_approved=True), COMMENT_WEIGHT),
+    )
+    for queryset, weight in sources:
+        rows = (
+            queryset.filter(created_at__gt=since, created_at__lte=until)
+            .annotate(bucket=TruncHour('created_at'))
+            .values_list('post_id', 'bucket')
+            .annotate(events=Count('id'))
+            .order_by()
+        )
+        for post_id, bucket, events in rows.iterator():
+            yield post_id, math.log(weight * events) + decay_exponent(bucket)
+
+
+def update_trending_scores(until=None, full=False):
+    """
+    Fold the activity since the previous run into the stored scores and
+    return the number of posts rescored.
+
+    The previous run is the newest `updated_at` in the table, so only posts
+    with new likes or comments are read and written. `full` (or an empty
+    table) rebuilds every score from the last WINDOW of activity.
+    """
+    until = until or timezone.now()
+    since = None if full else PostTrendingScore.objects.aggregate(last=Max('updated_at'))['last']
+    if since is None:
+        PostTrendingScore.objects.all().delete()
+        since = until - WINDOW
+
+    deltas = {}
+    for post_id, value in activity_buckets(since, until):
+        deltas[post_id] = logaddexp(deltas[post_id], value) if post_id in deltas else value
+
+    post_ids = list(deltas)
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        batch = post_ids[start:start + BATCH_SIZE]
+        current = dict(PostTrendingScore.objects.filter(post_id__in=batch).values_list('post_id', 'score'))
+        PostTrendingScore.objects.bulk_create(
+            [
+                PostTrendingScore(
+                    post_id=post_id,
+                    score=logaddexp(current[post_id], deltas[post_id]) if post_id in current else deltas[post_id],
+                    updated_at=until,
+                )
+                for post_id in batch
+            ],
+            update_conflicts=True,
+            unique_fields=['post'],
+            update_fields=['score', 'updated_at'],
+        )
+
+    PostTrendingScore.objects.filter(updated_at__lt=until - WINDOW).delete()
+    return len(post_ids)
+
+
+def trending_queryset():
+    return Post.objects.filter(is_published=True, is_premium=False, trending__isnull=False)
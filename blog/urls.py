@@ -9,9 +9,14 @@ router.register(r'my-comments', views.UserCommentView, basename='my-comments')
 
 app_name = 'blog'
 urlpatterns = [
+    path('timeline/', views.TimelineView.as_view(), name='timeline'),
     path('post/comments/', views.ListCommentsView.as_view(), name='post_comments'),
     path('post/like/<slug:post_slug>/', views.PostLikeView.as_view(), name='post_like'),
     path('post/comment/like/<int:comment_id>/', views.CommentLikeView.as_view(), name='comment_like'),
+    path('posts/search/', views.SearchPostView.as_view(), name='posts-search'),
+    path('categories/', views.CategoryListView.as_view(), name='categories'),
+    path('tags/', views.TagCloudView.as_view(), name='tags'),
+    path('posts/trending/', views.TrendingPostView.as_view(), name='posts-trending'),
     path('posts/premium/', views.ReadOnlyPremiumPostView.as_view({'get': 'list'}), name='premium-posts-list'),
     path('posts/premium/<slug:slug>/', views.ReadOnlyPremiumPostView.as_view({'get': 'retrieve'}), name='premium-posts-detail'),
 
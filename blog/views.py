@@ -1,52 +1,204 @@
 from rest_framework.generics import ListAPIView
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from .models import Post, Comment, PostLike, CommentLike
-from .serializers import ReadOnlyPostSerializer, UserPostSerilaizer, CommentSerializer, PostLikeSerializer, CommentLikeSerializer
+from .serializers import ReadOnlyPostSerializer, UserPostSerilaizer, CommentSerializer, PostLikeSerializer, CommentLikeSerializer, \
+    CategorySerializer, TagSerializer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from .permissions import IsOwner
+from .comments import load_comment_tree
+from core.pagination import KeysetPagination
+from core.mixins import EagerLoadingMixin, CachedResponseMixin, ConditionalGetMixin, SparseFieldsetMixin, StreamingListMixin, make_etag
+from django.db.models import Count, Max, Q, Sum
+from django.http import Http404
+from .cache import post_response_cache
+from .search import get_search_backend
+from relationships.entitlements import get_entitled_author_ids
+from .timeline import timeline_queryset
+from .trending import trending_queryset
+from .taxonomy import taxonomy
+from .like_buffer import like_buffer
+from .slugs import slug_resolver, ResolvedSlugMixin
+from .post_rows import PostRowsListMixin
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 
-class ReadOnlyPublicPostView(ReadOnlyModelViewSet):
+POST_DEFERRABLE_COLUMNS = {
+    'content': ('content',),
+    'excerpt': ('excerpt',),
+    'image': ('image',),
+    'image_srcset': ('image_variants',),
+}
+
+
+class ReadOnlyPublicPostView(ResolvedSlugMixin, ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin,
+                             StreamingListMixin, EagerLoadingMixin, PostRowsListMixin, ReadOnlyModelViewSet):
     serializer_class = ReadOnlyPostSerializer
+    pagination_class = KeysetPagination
+    response_cache = post_response_cache
     lookup_field = 'slug'
+    validator_fields = ('id', 'updated_at', 'likes_count')
+    last_modified_field = None
+    deferrable_columns = POST_DEFERRABLE_COLUMNS
+    select_related_fields = ('author',)
+    prefetch_related_fields = ('tags',)
+    query_budget = 2
+
+    def is_visible(self, ref):
+        return ref.is_published and not ref.is_premium
 
     def get_queryset(self):
         return Post.objects.filter(is_published=True, is_premium=False)
 
 
-class ReadOnlyPremiumPostView(ReadOnlyModelViewSet):
+class ReadOnlyPremiumPostView(ResolvedSlugMixin, ConditionalGetMixin, SparseFieldsetMixin, EagerLoadingMixin,
+                              PostRowsListMixin, ReadOnlyModelViewSet):
     serializer_class = ReadOnlyPostSerializer
     permission_classes = [IsAuthenticated,]
+    pagination_class = KeysetPagination
     lookup_field = 'slug'
+    validator_fields = ('id', 'updated_at', 'likes_count')
+    last_modified_field = None
+    deferrable_columns = POST_DEFERRABLE_COLUMNS
+    select_related_fields = ('author',)
+    prefetch_related_fields = ('tags',)
+    query_budget = 2
+
+    def is_visible(self, ref):
+        return ref.is_published and ref.is_premium and ref.author_id in get_entitled_author_ids(self.request.user)
 
     def get_queryset(self):
-        authors = self.request.user.subscriptions.values_list('author', flat=True)
+        authors = get_entitled_author_ids(self.request.user)
         return Post.objects.filter(is_published=True, is_premium=True, author__in=authors)
     
 
-class UserPostView(ModelViewSet):
+class SearchPostView(EagerLoadingMixin, ListAPIView):
+    serializer_class = ReadOnlyPostSerializer
+    select_related_fields = ('author',)
+    prefetch_related_fields = ('tags',)
+    max_limit = 100
+
+    def get_limit(self):
+        limit = self.request.query_params.get('limit', '20')
+        if not limit.isdigit() or not 0 < int(limit) <= self.max_limit:
+            raise ValidationError({'limit':f'Must be an integer between 1 and {self.max_limit}'})
+        return int(limit)
+
+    def get_queryset(self):
+        return Post.objects.filter(is_published=True, is_premium=False)
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q':'This query parameter is required'})
+
+        ranked_ids = get_search_backend().search(query, limit=self.get_limit())
+        posts = self.filter_queryset(self.get_queryset()).in_bulk(ranked_ids)
+        results = [posts[post_id] for post_id in ranked_ids if post_id in posts]
+        serializer = self.get_serializer(results, many=True)
+        return Response(serializer.data)
+
+
+class TimelineView(EagerLoadingMixin, PostRowsListMixin, ListAPIView):
+    serializer_class = ReadOnlyPostSerializer
+    permission_classes = [IsAuthenticated,]
+    pagination_class = KeysetPagination
+    select_related_fields = ('author',)
+    prefetch_related_fields = ('tags',)
+    # posts and tags, with entitlements and high-fanout authors cached
+    query_budget = 2
+
+    def get_queryset(self):
+        return timeline_queryset(self.request.user)
+
+
+class TrendingPostView(EagerLoadingMixin, PostRowsListMixin, ListAPIView):
+    serializer_class = ReadOnlyPostSerializer
+    pagination_class = KeysetPagination
+    ordering = ('-trending__score', '-id')
+    query_budget = 2
+
+    def get_queryset(self):
+        return trending_queryset()
+
+
+class CategoryListView(APIView):
+    """Every category with its number of published posts, served from the taxonomy cache."""
+
+    def get(self, request):
+        return Response(CategorySerializer(taxonomy.categories(), many=True).data)
+
+
+class TagCloudView(APIView):
+    """Tags used by published posts, most used first, served from the taxonomy cache."""
+
+    def get(self, request):
+        return Response(TagSerializer(taxonomy.tag_cloud(), many=True).data)
+
+
+class UserPostView(ResolvedSlugMixin, ModelViewSet):
     serializer_class = UserPostSerilaizer
     permission_classes = [IsAuthenticated, IsOwner]
     lookup_field = 'slug'
 
+    def is_visible(self, ref):
+        return ref.author_id == self.request.user.id
+
     def get_queryset(self):
         return Post.objects.filter(author=self.request.user)
 
 
-class ListCommentsView(ListAPIView):
+class ListCommentsView(ConditionalGetMixin, EagerLoadingMixin, ListAPIView):
     serializer_class = CommentSerializer
+    pagination_class = KeysetPagination
+    ordering = ('created_at', 'id')
+    select_related_fields = ('user',)
+    # post with comment summary, root page, then every reply of the page's threads
+    query_budget = 3
+
+    def get_post(self):
+        if not hasattr(self, '_post'):
+            post_slug = self.request.query_params.get('post_slug')
+            if not post_slug:
+                raise ValidationError({'post_slug':'This query parameter is required'})
+            ref = slug_resolver.resolve(post_slug)
+            if ref is None:
+                raise Http404
+            approved = Q(comments__is_approved=True)
+            posts = Post.objects.only('id', 'title', 'updated_at').annotate(
+                approved_comments=Count('comments', filter=approved),
+                comments_modified=Max('comments__updated_at', filter=approved),
+                comment_likes=Sum('comments__likes_count', filter=approved),
+            )
+            self._post = get_object_or_404(posts, pk=ref.id)
+        return self._post
 
     def get_queryset(self):
-        post_slug = self.request.query_params.get('post_slug')
-        if not post_slug:
-            raise ValidationError({'post_slug':'This query parameter is required'})
-        post = get_object_or_404(Post, slug=post_slug)
-        return Comment.objects.filter(post = post, is_approved=True)
+        return Comment.objects.filter(post_id=self.get_post().id, is_approved=True, parent__isnull=True)
+
+    def get_limit_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        if not value.isdigit():
+            raise ValidationError({name:'Must be a non-negative integer'})
+        return int(value)
+
+    def get_list_validators(self):
+        # like counters change without touching updated_at, so there is no usable Last-Modified
+        post = self.get_post()
+        etag = make_etag(self.request.get_full_path(), post.updated_at, post.approved_comments,
+                         post.comments_modified, post.comment_likes)
+        return etag, None
+
+    def paginate_queryset(self, queryset):
+        max_depth = self.get_limit_param('max_depth')
+        max_replies = self.get_limit_param('max_replies')
+        roots = super().paginate_queryset(queryset)
+        return load_comment_tree(self.get_post(), roots=roots, max_depth=max_depth, max_replies=max_replies)
 
 
 class UserCommentView(ModelViewSet):
@@ -59,18 +211,46 @@ class UserCommentView(ModelViewSet):
 
 class PostLikeView(APIView):
     permission_classes = [IsAuthenticated,]
+
+    def get_post_id(self, post_slug):
+        ref = slug_resolver.resolve(post_slug)
+        if ref is None:
+            raise Http404
+        return ref.id
+
+    def is_liked(self, user, post_id):
+        pending = like_buffer.pending(user.id, post_id)
+        if pending is not None:
+            return pending
+        return PostLike.objects.filter(user=user, post_id=post_id).exists()
+
+    def get(self, request, post_slug):
+        post_id = self.get_post_id(post_slug)
+        return Response({'liked': self.is_liked(request.user, post_id)})
     
     def post(self, request, post_slug):
-        post = get_object_or_404(Post, slug=post_slug)
-        like, created = PostLike.objects.get_or_create(user=request.user, post=post)
+        post_id = self.get_post_id(post_slug)
+        if like_buffer.enabled:
+            if self.is_liked(request.user, post_id):
+                return Response({'detail':'Already liked'}, status=status.HTTP_400_BAD_REQUEST)
+            like_buffer.like(request.user.id, post_id)
+            return Response({'detail':'Like accepted'}, status=status.HTTP_202_ACCEPTED)
+
+        like, created = PostLike.objects.get_or_create(user=request.user, post_id=post_id)
         if not created:
             return Response({'detail':'Already liked'}, status=status.HTTP_400_BAD_REQUEST)
         serializer = PostLikeSerializer(instance=like)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     def delete(self, request, post_slug):
-        post = get_object_or_404(Post, slug=post_slug)
-        like = get_object_or_404(PostLike, user=request.user, post=post)
+        post_id = self.get_post_id(post_slug)
+        if like_buffer.enabled:
+            if not self.is_liked(request.user, post_id):
+                return Response({'detail':'Not liked'}, status=status.HTTP_404_NOT_FOUND)
+            like_buffer.unlike(request.user.id, post_id)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        like = get_object_or_404(PostLike, user=request.user, post_id=post_id)
         like.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
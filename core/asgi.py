@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# build per-process caches that would otherwise be built by the first request
+from accounts.tokens import blacklist_filter  # noqa: E402
+
+blacklist_filter.warm()
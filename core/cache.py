@@ -0,0 +1,74 @@
+import hashlib
+import time
+from django.core.cache import caches
+
+
+class VersionedCache:
+    """
+    A namespace of cached values invalidated by bumping a version key.
+
+    Entries are stored under the current version, so a bump makes every older
+    entry unreachable in O(1); the backend's own size limit (MAX_ENTRIES) evicts
+    them later. Versions start from a timestamp, so a version key lost to
+    eviction never brings back entries of an older version. Hits and misses
+    are counted in the same backend and reported by `stats()`.
+    """
+
+    def __init__(self, namespace, alias='default', timeout=None):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def version_key(self):
+        return f'{self.namespace}:version'
+
+    def version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    def bump(self):
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.add(self.version_key, time.time_ns(), timeout=None)
+
+    def make_key(self, identity):
+        digest = hashlib.md5(identity.encode('utf-8')).hexdigest()
+        return f'{self.namespace}:{self.version()}:{digest}'
+
+    def get(self, identity):
+        value = self.cache.get(self.make_key(identity))
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, identity, value):
+        self.cache.set(self.make_key(identity), value, timeout=self.timeout)
+
+    def stats(self):
+        counts = self.cache.get_many([self._stats_key('hits'), self._stats_key('misses')])
+        hits = counts.get(self._stats_key('hits'), 0)
+        misses = counts.get(self._stats_key('misses'), 0)
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_ratio': hits / total if total else 0.0}
+
+    def reset_stats(self):
+        self.cache.delete_many([self._stats_key('hits'), self._stats_key('misses')])
+
+    def _stats_key(self, name):
+        return f'{self.namespace}:stats:{name}'
+
+    def _count(self, name):
+        key = self._stats_key(name)
+        if not self.cache.add(key, 1, timeout=None):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                pass
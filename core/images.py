@@ -0,0 +1,119 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_QUALITY = 80
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_VARIANT_WORKERS', 2),
+            thread_name_prefix='image-variants',
+        )
+    return _executor
+
+
+def variant_name(name, width):
+    directory, filename = os.path.split(name)
+    base, _ = os.path.splitext(filename)
+    return os.path.join(directory, 'variants', f'{base}_{width}w.webp')
+
+
+def render_variants(field_file):
+    """Write WebP copies of `field_file` at each width not larger than the original and return {width: name}."""
+    storage = field_file.storage
+    with field_file.open('rb'), Image.open(field_file) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+        variants = {}
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            buffer = BytesIO()
+            image.resize((width, height), Image.LANCZOS).save(buffer, 'WEBP', quality=VARIANT_QUALITY, method=4)
+            name = variant_name(field_file.name, width)
+            if storage.exists(name):
+                storage.delete(name)
+            variants[str(width)] = storage.save(name, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def process_variants(model, pk, field_name, variants_field):
+    """Render the variants of one row and save them, firing post_save so caches and validators move on."""
+    try:
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None:
+            return
+        field_file = getattr(instance, field_name)
+        variants = {'source': field_file.name, 'widths': render_variants(field_file)} if field_file else {}
+        setattr(instance, variants_field, variants)
+        update_fields = [variants_field]
+        if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+            update_fields.append('updated_at')
+        instance.save(update_fields=update_fields)
+    finally:
+        if not getattr(settings, 'IMAGE_VARIANTS_SYNC', False):
+            connections.close_all()
+
+
+def needs_variants(instance, field_name, variants_field):
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, variants_field) or {}
+    return (field_file.name or None) != variants.get('source')
+
+
+def schedule_variants(instance, field_name, variants_field):
+    """
+    Queue variant rendering on the local worker pool once the transaction commits.
+    With IMAGE_VARIANTS_SYNC (tests, management commands) it runs inline instead.
+    """
+    args = (type(instance), instance.pk, field_name, variants_field)
+    if getattr(settings, 'IMAGE_VARIANTS_SYNC', False):
+        process_variants(*args)
+    else:
+        transaction.on_commit(lambda: submit_variants(*args))
+
+
+def submit_variants(model, pk, field_name, variants_field):
+    future = get_executor().submit(process_variants, model, pk, field_name, variants_field)
+
+    def log_failure(future):
+        if future.exception() is not None:
+            logger.error('Rendering %s variants of %s %s failed', field_name, model._meta.label, pk,
+                         exc_info=future.exception())
+
+    future.add_done_callback(log_failure)
+    return future
+
+
+def build_srcset(variants, request=None):
+    """Turn a stored variant map into {'<width>w': url}, absolute when a request is given."""
+    srcset = {}
+    for width, name in (variants or {}).get('widths', {}).items():
+        url = default_storage.url(name)
+        srcset[f'{width}w'] = request.build_absolute_uri(url) if request is not None else url
+    return srcset
+
+
+class SrcsetField(serializers.ReadOnlyField):
+    """Expose a stored variant map as a srcset-style {'<width>w': url} map."""
+
+    def to_representation(self, value):
+        return build_srcset(value, self.context.get('request'))
@@ -0,0 +1,234 @@
+import hashlib
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class EagerLoadingMixin:
+    """
+    Load the relations a view's serializer reads together with its queryset.
+
+    Views list them in `select_related_fields` and `prefetch_related_fields`, so
+    a page costs a fixed number of queries however many rows it holds.
+    `query_budget` documents that number and is enforced by the test suite.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    query_budget = None
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    Serve `list` and `retrieve` for anonymous readers from `response_cache`.
+
+    Responses are keyed by the full URL including query parameters and dropped
+    by bumping the cache's version, never by deleting keys one by one.
+    """
+    response_cache = None
+
+    def is_cacheable(self, request):
+        return request.method == 'GET' and not request.user.is_authenticated
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if self.response_cache is None or not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        identity = request.build_absolute_uri()
+        data = self.response_cache.get(identity)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and isinstance(response, Response):
+            self.response_cache.set(identity, response.data)
+            response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Answer `list` and `retrieve` with 304 Not Modified when the client's
+    If-None-Match / If-Modified-Since still match.
+
+    Validators come from a cheap metadata query (`validator_fields` of the
+    looked-up row, or `get_list_validators()` for lists) that runs before the
+    full row is loaded and serialized. The ETag of a row also covers the
+    request's path and query string, which can change the body. Views whose
+    ETag covers more than `last_modified_field` (counters written with
+    `.update()`, related rows) set it to None so no Last-Modified is sent.
+    """
+    validator_fields = ('id', 'updated_at')
+    last_modified_field = 'updated_at'
+
+    def get_lookup_kwargs(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def get_object_validators(self):
+        row = self.get_queryset().filter(**self.get_lookup_kwargs()).values(*self.validator_fields).first()
+        if row is None:
+            return None, None
+        last_modified = row[self.last_modified_field] if self.last_modified_field else None
+        return make_etag(self.request.get_full_path(), *row.values()), last_modified
+
+    def get_list_validators(self):
+        return None, None
+
+    def conditional_response(self, handler, validators, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = validators()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        if etag or timestamp:
+            not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if not_modified is not None:
+                return self.set_validators(not_modified, etag, timestamp)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            self.set_validators(response, etag, timestamp)
+        return response
+
+    def set_validators(self, response, etag, timestamp):
+        if etag:
+            response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, self.get_list_validators, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, self.get_object_validators, request, *args, **kwargs)
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients pick response fields with `?fields=a,b` and/or `?exclude=c`.
+
+    Unselected fields are dropped from the serializer, and the model columns
+    listed for them in `deferrable_columns` ({field: (column, ...)}) are
+    deferred so they are never read from the database.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+    deferrable_columns = {}
+
+    def get_sparse_fields(self):
+        """The ordered field names to render, or None when the full representation is wanted."""
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+
+        params = self.request.query_params
+        requested = self._split(params.get(self.fields_query_param))
+        excluded = self._split(params.get(self.exclude_query_param))
+        self._sparse_fields = None
+        if requested or excluded:
+            available = list(self.get_serializer_class()().fields)
+            unknown = [name for name in requested + excluded if name not in available]
+            if unknown:
+                raise ValidationError({'fields': f'Unknown field(s): {", ".join(unknown)}'})
+            self._sparse_fields = [
+                name for name in available
+                if (not requested or name in requested) and name not in excluded
+            ]
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            needed = {column for name in fields for column in self.deferrable_columns.get(name, ())}
+            deferred = {
+                column for columns in self.deferrable_columns.values() for column in columns
+            } - needed
+            if deferred:
+                queryset = queryset.defer(*deferred)
+        return queryset
+
+    @staticmethod
+    def _split(value):
+        return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class StreamingListMixin:
+    """
+    Stream the whole `list` as a JSON array when the client asks for `?stream=1`.
+
+    Rows are read with `.iterator(chunk_size=stream_chunk_size)` and rendered
+    one at a time by the negotiated JSONRenderer, so memory stays flat however
+    large the result. The body is byte-for-byte what rendering the full list
+    would produce; pagination is skipped but its ordering is kept.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def wants_stream(self, request):
+        if request.method != 'GET' or request.query_params.get(self.stream_query_param) not in ('1', 'true'):
+            return False
+        renderer = getattr(request, 'accepted_renderer', None)
+        if not isinstance(renderer, JSONRenderer):
+            return False
+        return renderer.get_indent(request.accepted_media_type, {}) is None
+
+    def get_stream_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            queryset = queryset.order_by(*paginator.get_ordering(self.request, queryset, self))
+        return queryset
+
+    def stream_rows(self, queryset, renderer, media_type):
+        serializer = self.get_serializer()
+        context = self.get_renderer_context()
+        yield b'['
+        for index, instance in enumerate(queryset.iterator(chunk_size=self.stream_chunk_size)):
+            if index:
+                yield b','
+            yield renderer.render(serializer.to_representation(instance), media_type, context)
+        yield b']'
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_stream(request):
+            return super().list(request, *args, **kwargs)
+        renderer = request.accepted_renderer
+        rows = self.stream_rows(self.get_stream_queryset(), renderer, request.accepted_media_type)
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return StreamingHttpResponse(rows, content_type=content_type)
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
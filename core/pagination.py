@@ -0,0 +1,104 @@
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a compound key such as `(created_at, id)`.
+
+    The cursor stores the full key of the last row, so every page is a
+    `WHERE key < cursor ORDER BY key LIMIT n` range scan: no OFFSET and no
+    COUNT(*), whatever the page number. Views may override the key with an
+    `ordering` attribute; its last field must be unique. Pages may be model
+    instances or `values()` dicts that include the ordering fields.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = tuple(self._flip(field) for field in self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._keyset_filter(queryset.model, ordering, self.cursor.position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self._position(self.page[0])))
+
+    def _position(self, instance):
+        values = []
+        for field in self.ordering:
+            if isinstance(instance, dict):
+                value = instance[field.lstrip('-')]
+            else:
+                value = instance
+                for attr in field.lstrip('-').split('__'):
+                    value = getattr(value, attr)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return json.dumps(values)
+
+    def _keyset_filter(self, model, ordering, position):
+        try:
+            values = json.loads(position)
+            if len(values) != len(ordering):
+                raise ValueError('Cursor does not match the ordering')
+            fields = [self._resolve_field(model, field.lstrip('-')) for field in ordering]
+            values = [field.to_python(value) for field, value in zip(fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            equal = {ordering[i].lstrip('-'): values[i] for i in range(index)}
+            condition |= Q(**equal, **{name + lookup: values[index]})
+        return condition
+
+    @staticmethod
+    def _resolve_field(model, path):
+        *relations, name = path.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        if name == 'pk':
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -133,10 +134,52 @@ AUTH_USER_MODEL = 'accounts.User'
 #REST FRAMEWORK
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     )
 }
 
+SIMPLE_JWT = {
+    # checks the refresh token against an in-process filter of blacklisted JTIs first
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.tokens.FilteredTokenRefreshSerializer',
+}
+# Seconds between checks of BlacklistedToken for rows written by other processes;
+# a token blacklisted elsewhere can still be refreshed for at most this long. 0 checks every refresh.
+BLACKLIST_SYNC_INTERVAL = 5
+
+#Cache
+# 'default' holds profile cards and premium entitlements, and invalidations from signals
+# and management commands only reach the processes sharing it. Point it at Redis/Memcached
+# in production; with LocMemCache they stay stale for up to accounts.cards.CARD_TTL and
+# relationships.entitlements.MAX_TTL.
+# Swap the backend of 'responses' to 'django.core.cache.backends.filebased.FileBasedCache'
+# with a directory as LOCATION to share cached responses between worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogspace',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogspace-responses',
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
+#OTP
+# 'accounts.otp.CacheOTPBackend' keeps codes in OTP_CACHE_ALIAS with native expiry;
+# it needs a cache shared by all workers (Redis/Memcached), not LocMemCache.
+OTP_BACKEND = 'accounts.otp.DatabaseOTPBackend'
+OTP_CACHE_ALIAS = 'default'
+
+#SMS
+# Messages are queued in accounts.SMSMessage and delivered by `python manage.py send_sms`.
+SMS_PROVIDER = 'accounts.sms.KavenegarProvider'
+KAVENEGAR_API_KEY = os.environ.get('KAVENEGAR_API_KEY', '')
+KAVENEGAR_SENDER = os.environ.get('KAVENEGAR_SENDER', '')
+
 #Media
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
\ No newline at end of file
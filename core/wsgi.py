@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# build per-process caches that would otherwise be built by the first request
+from accounts.tokens import blacklist_filter  # noqa: E402
+
+blacklist_filter.warm()
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils import timezone
 from .models import Follow, Subscribe
 
 
@@ -9,9 +10,28 @@ class FollowAdmin(admin.ModelAdmin):
     search_fields = ('author',)
 
 
+class SubscriptionStatusFilter(admin.SimpleListFilter):
+    title = 'status'
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return [('active', 'Active'), ('expired', 'Expired')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'active':
+            return queryset.active()
+        if self.value() == 'expired':
+            return queryset.expired()
+        return queryset
+
+
 @admin.register(Subscribe)
 class SubscribeAdmin(admin.ModelAdmin):
     ordering = ('-updated_at',)
-    list_display = ('author', 'subscriber', 'created_at', 'updated_at', 'expired_at', 'is_active',)
+    list_display = ('author', 'subscriber', 'created_at', 'updated_at', 'expires_at', 'is_active',)
     search_fields = ('author',)
-    list_filter = ('duration',)
\ No newline at end of file
+    list_filter = (SubscriptionStatusFilter, 'duration', 'expires_at')
+
+    @admin.display(boolean=True, ordering='expires_at')
+    def is_active(self, obj):
+        return obj.expires_at > timezone.now()
\ No newline at end of file
@@ -0,0 +1,84 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from accounts.cards import invalidate_card
+from accounts.models import User
+from .models import Follow, Subscribe
+
+
+def _count_subquery(model, fk_name, **filters):
+    rows = model.objects.filter(**{fk_name: OuterRef('pk')}, **filters).order_by()
+    return Coalesce(Subquery(rows.values(fk_name).annotate(total=Count('pk')).values('total')), 0)
+
+
+def followers_subquery():
+    return _count_subquery(Follow, 'author')
+
+
+def following_subquery():
+    return _count_subquery(Follow, 'follower')
+
+
+def subscribers_subquery():
+    """Subscriptions still counted for the author: active ones plus expiries the sweep has not reached."""
+    return _count_subquery(Subscribe, 'author', expiry_processed=False)
+
+
+def adjust_counter(user_id, field, delta):
+    """Move one stored counter atomically; decrements never go below zero."""
+    users = User.objects.filter(pk=user_id)
+    if delta < 0:
+        users = users.filter(**{f'{field}__gte': -delta})
+    return users.update(**{field: F(field) + delta})
+
+
+def count_new_follows(follower_id, author_ids):
+    """Counter updates for follows inserted with `bulk_create`, which sends no signals."""
+    User.objects.filter(pk__in=author_ids).update(followers_count=F('followers_count') + 1)
+    adjust_counter(follower_id, 'following_count', len(author_ids))
+
+
+def drifted_users(user_ids):
+    return list(
+        User.objects.filter(pk__in=user_ids)
+        .annotate(actual_followers=followers_subquery(), actual_following=following_subquery(),
+                  actual_subscribers=subscribers_subquery())
+        .exclude(followers_count=F('actual_followers'), following_count=F('actual_following'),
+                 subscribers_count=F('actual_subscribers'))
+        .values_list('pk', flat=True)
+    )
+
+
+def sync_user_counts(user_ids):
+    return User.objects.filter(pk__in=user_ids).update(
+        followers_count=followers_subquery(),
+        following_count=following_subquery(),
+        subscribers_count=subscribers_subquery(),
+    )
+
+
+def sweep_expired_subscriptions(batch_size=1000, now=None):
+    """
+    Take one batch of newly expired subscriptions out of their authors'
+    subscribers_count and mark them processed. Returns the batch size; call
+    until it is 0. Rows are found through the partial pending-expiry index.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(
+            Subscribe.objects.select_for_update(skip_locked=True).pending_expiry(now)
+            .order_by('expires_at').values_list('pk', 'author_id')[:batch_size]
+        )
+        if not rows:
+            return 0
+        Subscribe.objects.filter(pk__in=[pk for pk, author_id in rows]).update(expiry_processed=True)
+        expired = Counter(author_id for pk, author_id in rows)
+        User.objects.filter(pk__in=expired).update(subscribers_count=Greatest(
+            F('subscribers_count') - Case(*[When(pk=author_id, then=Value(total)) for author_id, total in expired.items()]),
+            0,
+        ))
+    for author_id in expired:
+        invalidate_card(author_id)
+    return len(rows)
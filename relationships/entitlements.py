@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.utils import timezone
+from .models import Subscribe
+
+
+# Upper bound for users without subscriptions or with far-away expiries. Signals only
+# reach the cache of their own process, so this also bounds how long a change made by
+# another process goes unseen while the default cache is per-process.
+MAX_TTL = 60
+
+
+def entitlements_key(user_id):
+    return f'relationships:entitlements:{user_id}'
+
+
+def get_entitled_author_ids(user):
+    """
+    Return the frozenset of author ids `user` is actively subscribed to.
+    The set is cached until the earliest active subscription expires (at most
+    MAX_TTL) and dropped by signals whenever the user's subscriptions change.
+    """
+    key = entitlements_key(user.pk)
+    authors = cache.get(key)
+    if authors is not None:
+        return authors
+
+    now = timezone.now()
+    active = list(Subscribe.objects.filter(subscriber_id=user.pk).active(now).values_list('author_id', 'expires_at'))
+    authors = frozenset(author_id for author_id, expires_at in active)
+
+    timeout = MAX_TTL
+    for author_id, expires_at in active:
+        timeout = min(timeout, (expires_at - now).total_seconds())
+    cache.set(key, authors, timeout=max(int(timeout), 1))
+    return authors
+
+
+def invalidate_entitlements(user_id):
+    cache.delete(entitlements_key(user_id))
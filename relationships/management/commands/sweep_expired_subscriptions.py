@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from relationships.counters import sweep_expired_subscriptions
+
+
+class Command(BaseCommand):
+    help = "Take newly expired subscriptions out of their authors' subscriber counts, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        swept = 0
+        while True:
+            batch = sweep_expired_subscriptions(options['batch_size'])
+            if not batch:
+                break
+            swept += batch
+        self.stdout.write(self.style.SUCCESS(f'{swept} expired subscriptions swept'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from accounts.models import User
+from relationships.counters import drifted_users, sync_user_counts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or reconcile the stored follower, following and subscriber counts of users in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Rewrite every counter instead of only the drifted ones.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted counters without fixing them.')
+
+    def handle(self, *args, **options):
+        fixed = 0
+        for ids in self.batches(options['batch_size']):
+            if not options['rebuild']:
+                ids = drifted_users(ids)
+            if ids and not options['dry_run']:
+                sync_user_counts(ids)
+            fixed += len(ids)
+
+        verb = 'drifted' if options['dry_run'] else 'synced'
+        self.stdout.write(self.style.SUCCESS(f'{fixed} users {verb}'))
+
+    def batches(self, batch_size):
+        last_pk = 0
+        while True:
+            ids = list(User.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return
+            yield ids
+            last_pk = ids[-1]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='followers', to=settings.AUTH_USER_MODEL)),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('author', 'follower'), name='unique_author_follower')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Subscribe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('duration', models.IntegerField(choices=[(1, 'a month'), (3, 'three months'), (6, 'six months'), (12, 'a year')])),
+                ('expires_at', models.DateTimeField(db_index=True, editable=False)),
+                ('expiry_processed', models.BooleanField(default=False, editable=False)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscribers', to=settings.AUTH_USER_MODEL)),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['subscriber', 'expires_at'], name='subscribe_subscriber_exp_idx'), models.Index(condition=models.Q(('expiry_processed', False)), fields=['expires_at'], name='subscribe_pending_expiry_idx')],
+                'constraints': [models.UniqueConstraint(fields=('author', 'subscriber'), name='unique_author_subscriber')],
+            },
+        ),
+    ]
@@ -18,6 +18,18 @@ class Follow(models.Model):
         return f'{self.follower} follow {self.author}'
 
 
+class SubscribeQuerySet(models.QuerySet):
+    def active(self, now=None):
+        return self.filter(expires_at__gt=now or timezone.now())
+
+    def expired(self, now=None):
+        return self.filter(expires_at__lte=now or timezone.now())
+
+    def pending_expiry(self, now=None):
+        """Expired subscriptions still counted in their author's subscribers_count."""
+        return self.expired(now).filter(expiry_processed=False)
+
+
 class Subscribe(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='subscribers')
     subscriber = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='subscriptions')
@@ -29,19 +41,38 @@ class Subscribe(models.Model):
         (6, 'six months'),
         (12, 'a year'),
     ])
+    expires_at = models.DateTimeField(editable=False, db_index=True)
+    # Set once the sweep has taken an expired subscription out of subscribers_count.
+    expiry_processed = models.BooleanField(default=False, editable=False)
+
+    objects = SubscribeQuerySet.as_manager()
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['author', 'subscriber'], name='unique_author_subscriber')
         ]
+        indexes = [
+            models.Index(fields=['subscriber', 'expires_at'], name='subscribe_subscriber_exp_idx'),
+            models.Index(fields=['expires_at'], condition=models.Q(expiry_processed=False),
+                         name='subscribe_pending_expiry_idx'),
+        ]
 
     def __str__(self):
         return f'{self.subscriber} subscribed {self.author}'
+
+    def save(self, *args, **kwargs):
+        # Every save starts a new period, like the auto_now updated_at it follows.
+        self.expires_at = timezone.now() + relativedelta(months=self.duration)
+        self.expiry_processed = False
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'expires_at', 'expiry_processed'}
+        super().save(*args, **kwargs)
     
     @property
     def expired_at(self):
-        return self.updated_at + relativedelta(months=self.duration)
+        return self.expires_at
     
     @property
     def is_active(self):
-        return timezone.now() < self.expired_at
\ No newline at end of file
+        return timezone.now() < self.expires_at
\ No newline at end of file
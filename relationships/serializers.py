@@ -3,6 +3,10 @@ from .models import Follow, Subscribe
 from accounts.models import User
 
 
+# Most usernames accepted by one bulk follow or unfollow request.
+MAX_BULK_FOLLOW = 100
+
+
 class FollowSerializer(serializers.ModelSerializer):
     author = serializers.SlugField('username')
 
@@ -29,6 +33,11 @@ class FollowSerializer(serializers.ModelSerializer):
         return data
 
 
+class FollowBulkSerializer(serializers.Serializer):
+    usernames = serializers.ListField(child=serializers.CharField(max_length=255), allow_empty=False,
+                                      max_length=MAX_BULK_FOLLOW)
+
+
 class SubscribeCreateSerializer(serializers.ModelSerializer):
     author = serializers.SlugField('username')
     duration = serializers.ChoiceField(choices=[(1, 'a month'),(3, 'three months'),(6, 'six months'),(12, 'a year')])
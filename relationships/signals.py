@@ -0,0 +1,61 @@
+from django.dispatch import receiver, Signal
+from django.db.models.signals import pre_save, post_save, post_delete
+from accounts.cards import invalidate_card
+from .models import Follow, Subscribe
+from .entitlements import invalidate_entitlements
+from .counters import adjust_counter, count_new_follows
+
+
+# Sent with `follower_id` and `author_ids` after FollowView.bulk inserts follows
+# with bulk_create, which skips post_save.
+follows_bulk_created = Signal()
+
+
+@receiver([post_save, post_delete], sender=Subscribe)
+def drop_cached_entitlements(sender, instance, **kwargs):
+    invalidate_entitlements(instance.subscriber_id)
+
+
+@receiver(post_save, sender=Follow)
+def increment_follow_counts(sender, instance, created, **kwargs):
+    if created:
+        adjust_counter(instance.author_id, 'followers_count', 1)
+        adjust_counter(instance.follower_id, 'following_count', 1)
+        invalidate_card(instance.author_id)
+        invalidate_card(instance.follower_id)
+
+
+@receiver(follows_bulk_created, sender=Follow)
+def count_bulk_follows(sender, follower_id, author_ids, **kwargs):
+    count_new_follows(follower_id, author_ids)
+    for user_id in (follower_id, *author_ids):
+        invalidate_card(user_id)
+
+
+@receiver(post_delete, sender=Follow)
+def decrement_follow_counts(sender, instance, **kwargs):
+    adjust_counter(instance.author_id, 'followers_count', -1)
+    adjust_counter(instance.follower_id, 'following_count', -1)
+    invalidate_card(instance.author_id)
+    invalidate_card(instance.follower_id)
+
+
+@receiver(pre_save, sender=Subscribe)
+def remember_subscription_state(sender, instance, **kwargs):
+    instance._was_counted = (
+        instance.pk is not None and Subscribe.objects.filter(pk=instance.pk, expiry_processed=False).exists()
+    )
+
+
+@receiver(post_save, sender=Subscribe)
+def count_active_subscription(sender, instance, **kwargs):
+    if not getattr(instance, '_was_counted', False):
+        adjust_counter(instance.author_id, 'subscribers_count', 1)
+        invalidate_card(instance.author_id)
+
+
+@receiver(post_delete, sender=Subscribe)
+def uncount_active_subscription(sender, instance, **kwargs):
+    if not instance.expiry_processed:
+        adjust_counter(instance.author_id, 'subscribers_count', -1)
+        invalidate_card(instance.author_id)
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from accounts.tests import make_user
+from relationships.models import Follow, Subscribe
+
+
+class RelationshipCounterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = make_user(0)
+        self.reader = make_user(1)
+
+    def counts(self, user):
+        user.refresh_from_db()
+        return user.followers_count, user.following_count, user.subscribers_count
+
+    def test_follow_counts_follow_rows(self):
+        follow = Follow.objects.create(author=self.author, follower=self.reader)
+        self.assertEqual(self.counts(self.author), (1, 0, 0))
+        self.assertEqual(self.counts(self.reader), (0, 1, 0))
+
+        follow.delete()
+        self.assertEqual(self.counts(self.author), (0, 0, 0))
+        self.assertEqual(self.counts(self.reader), (0, 0, 0))
+
+    def test_decrement_never_goes_negative(self):
+        follow = Follow.objects.create(author=self.author, follower=self.reader)
+        User.objects.update(followers_count=0, following_count=0)
+        follow.delete()
+        self.assertEqual(self.counts(self.author), (0, 0, 0))
+
+    def test_only_active_subscriptions_are_counted(self):
+        subscription = Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=1)
+        self.assertEqual(self.counts(self.author)[2], 1)
+
+        subscription.delete()
+        self.assertEqual(self.counts(self.author)[2], 0)
+
+    def test_renewing_an_expired_subscription_counts_it_again(self):
+        subscription = Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=1)
+        Subscribe.objects.filter(pk=subscription.pk).update(expires_at=timezone.now() - timedelta(days=1))
+        call_command('sweep_expired_subscriptions', stdout=StringIO())
+        self.assertEqual(self.counts(self.author)[2], 0)
+
+        subscription.refresh_from_db()
+        subscription.duration = 3
+        subscription.save()
+        self.assertEqual(self.counts(self.author)[2], 1)
+
+    def test_saving_a_stale_user_keeps_counters(self):
+        stale = User.objects.get(pk=self.author.pk)
+        Follow.objects.create(author=self.author, follower=self.reader)
+        stale.email = "changed@gmail.com"
+        stale.save()
+        self.assertEqual(self.counts(self.author), (1, 0, 0))
+        self.assertEqual(self.author.email, "changed@gmail.com")
+
+    def test_sync_command_repairs_drift(self):
+        Follow.objects.create(author=self.author, follower=self.reader)
+        expired = Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=1)
+        Subscribe.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(days=1))
+        call_command('sweep_expired_subscriptions', stdout=StringIO())
+        User.objects.filter(pk=self.author.pk).update(followers_count=7, subscribers_count=3)
+
+        out = StringIO()
+        call_command('sync_relationship_counts', '--dry-run', stdout=out)
+        self.assertIn('1 users drifted', out.getvalue())
+        self.assertEqual(self.counts(self.author), (7, 0, 3))
+
+        call_command('sync_relationship_counts', stdout=StringIO())
+        self.assertEqual(self.counts(self.author), (1, 0, 0))
+        self.assertEqual(self.counts(self.reader), (0, 1, 0))
+
+
+class ProfileCounterTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = make_user(0)
+        self.reader = make_user(1)
+        self.client.force_authenticate(user=self.reader)
+
+    def test_follow_endpoints_update_profile_counts(self):
+        response = self.client.post(reverse('relationships:follow-list'), {'author': 'user0'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(reverse('accounts:profiles-detail', args=[self.author.profile.pk]))
+        self.assertEqual(response.data['followers_count'], 1)
+        self.assertEqual(response.data['subscribers_count'], 0)
+
+        response = self.client.get(reverse('accounts:profile-me'))
+        self.assertEqual(response.data['following_count'], 1)
+
+    def test_profile_etag_changes_with_counts(self):
+        url = reverse('accounts:profiles-detail', args=[self.author.profile.pk])
+        etag = self.client.get(url)['ETag']
+
+        Follow.objects.create(author=self.author, follower=self.reader)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['followers_count'], 1)
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.tests import make_user
+from blog.models import Post
+from relationships.models import Subscribe
+from relationships.entitlements import MAX_TTL, get_entitled_author_ids
+
+
+class EntitlementServiceTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.active_author = make_user(1)
+        self.expired_author = make_user(2)
+        Subscribe.objects.create(author=self.active_author, subscriber=self.reader, duration=1)
+        expired = Subscribe.objects.create(author=self.expired_author, subscriber=self.reader, duration=1)
+        Subscribe.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(days=1))
+
+    def test_only_active_subscriptions_count(self):
+        self.assertEqual(get_entitled_author_ids(self.reader), {self.active_author.pk})
+
+    def test_result_is_cached(self):
+        get_entitled_author_ids(self.reader)
+        with self.assertNumQueries(0):
+            get_entitled_author_ids(self.reader)
+
+    def test_ttl_ends_at_earliest_expiry(self):
+        expires_soon = timezone.now() + timedelta(seconds=30)
+        Subscribe.objects.filter(author=self.active_author).update(expires_at=expires_soon)
+
+        with mock.patch('relationships.entitlements.cache.set') as cache_set:
+            get_entitled_author_ids(self.reader)
+        timeout = cache_set.call_args.kwargs['timeout']
+        self.assertTrue(20 < timeout <= 30, timeout)
+
+    def test_ttl_is_capped(self):
+        with mock.patch('relationships.entitlements.cache.set') as cache_set:
+            get_entitled_author_ids(self.reader)
+        self.assertEqual(cache_set.call_args.kwargs['timeout'], MAX_TTL)
+
+    def test_subscription_changes_invalidate(self):
+        get_entitled_author_ids(self.reader)
+        other = make_user(3)
+        subscription = Subscribe.objects.create(author=other, subscriber=self.reader, duration=3)
+        self.assertIn(other.pk, get_entitled_author_ids(self.reader))
+
+        subscription.delete()
+        self.assertNotIn(other.pk, get_entitled_author_ids(self.reader))
+
+
+class PremiumFeedEntitlementTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.active_author = make_user(1)
+        self.expired_author = make_user(2)
+        Subscribe.objects.create(author=self.active_author, subscriber=self.reader, duration=1)
+        expired = Subscribe.objects.create(author=self.expired_author, subscriber=self.reader, duration=1)
+        Subscribe.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(days=1))
+        Post.objects.create(author=self.active_author, title="Paid", content="c", is_published=True, is_premium=True)
+        Post.objects.create(author=self.expired_author, title="Lapsed", content="c", is_published=True, is_premium=True)
+        self.client.force_authenticate(user=self.reader)
+
+    def test_expired_subscription_hides_premium_posts(self):
+        response = self.client.get(reverse('blog:premium-posts-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([post['title'] for post in response.data['results']], ['Paid'])
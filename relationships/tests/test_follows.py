@@ -0,0 +1,91 @@
+from unittest import mock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.tests import make_user
+from blog.models import Post, TimelineEntry
+from relationships.models import Follow
+from relationships.views import FollowView
+
+
+class BulkFollowTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.authors = [make_user(i) for i in range(1, 5)]
+        self.client.force_authenticate(user=self.reader)
+        self.url = reverse('relationships:follow-bulk')
+
+    def statuses(self, response):
+        return [(item['username'], item['status']) for item in response.data['results']]
+
+    def test_follow_reports_each_username(self):
+        Follow.objects.create(author=self.authors[0], follower=self.reader)
+
+        response = self.client.post(self.url, {'usernames': ['user1', 'user2', 'ghost', 'user0', 'user3', 'user2']},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.statuses(response), [
+            ('user1', 'already_following'), ('user2', 'followed'), ('ghost', 'not_found'),
+            ('user0', 'self'), ('user3', 'followed'),
+        ])
+        self.assertEqual(
+            set(Follow.objects.filter(follower=self.reader).values_list('author__username', flat=True)),
+            {'user1', 'user2', 'user3'},
+        )
+
+    def test_follow_uses_a_fixed_number_of_queries(self):
+        usernames = [author.username for author in self.authors]
+        # authors, existing follows, savepoint pair, insert, two counter updates,
+        # celebrity authors and one backfill read, however many usernames are sent
+        with self.assertNumQueries(9):
+            self.client.post(self.url, {'usernames': usernames}, format='json')
+
+    def test_follow_updates_counters_and_timeline(self):
+        Post.objects.create(author=self.authors[1], title="Hello", content="Body", is_published=True)
+
+        self.client.post(self.url, {'usernames': ['user1', 'user2']}, format='json')
+        self.reader.refresh_from_db()
+        self.authors[1].refresh_from_db()
+        self.assertEqual(self.reader.following_count, 2)
+        self.assertEqual(self.authors[1].followers_count, 1)
+        self.assertEqual(list(TimelineEntry.objects.filter(user=self.reader).values_list('post__title', flat=True)),
+                         ['Hello'])
+
+    def test_follows_inserted_concurrently_are_not_counted_twice(self):
+        insert_follows = FollowView.insert_follows
+
+        def race(view, author_ids):
+            # a double-submitted form follows user2 between the read and the insert
+            Follow.objects.create(author=self.authors[1], follower=self.reader)
+            return insert_follows(view, author_ids)
+
+        with mock.patch.object(FollowView, 'insert_follows', autospec=True, side_effect=race):
+            response = self.client.post(self.url, {'usernames': ['user1', 'user2']}, format='json')
+
+        self.assertEqual(self.statuses(response), [('user1', 'followed'), ('user2', 'already_following')])
+        self.reader.refresh_from_db()
+        self.authors[1].refresh_from_db()
+        self.assertEqual(self.reader.following_count, 2)
+        self.assertEqual(self.authors[1].followers_count, 1)
+
+    def test_unfollow(self):
+        Follow.objects.create(author=self.authors[0], follower=self.reader)
+
+        response = self.client.delete(self.url, {'usernames': ['user1', 'user2', 'ghost']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.statuses(response), [
+            ('user1', 'unfollowed'), ('user2', 'not_following'), ('ghost', 'not_found'),
+        ])
+        self.assertFalse(Follow.objects.exists())
+        self.reader.refresh_from_db()
+        self.assertEqual(self.reader.following_count, 0)
+
+    def test_rejects_empty_and_oversized_lists(self):
+        response = self.client.post(self.url, {'usernames': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'usernames': [f'user{i}' for i in range(101)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
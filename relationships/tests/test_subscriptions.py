@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+from dateutil.relativedelta import relativedelta
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.tests import make_user
+from relationships.admin import SubscribeAdmin, SubscriptionStatusFilter
+from relationships.counters import sweep_expired_subscriptions
+from relationships.models import Subscribe
+
+
+def expire(subscription):
+    Subscribe.objects.filter(pk=subscription.pk).update(expires_at=timezone.now() - timedelta(days=1))
+
+
+class SubscriptionExpiryTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.author = make_user(1)
+        self.other = make_user(2)
+        self.active = Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=3)
+        self.lapsed = Subscribe.objects.create(author=self.other, subscriber=self.reader, duration=1)
+        expire(self.lapsed)
+
+    def subscribers(self, user):
+        user.refresh_from_db()
+        return user.subscribers_count
+
+    def test_expiry_is_stored_on_create(self):
+        expected = self.active.updated_at + relativedelta(months=3)
+        self.assertAlmostEqual(self.active.expires_at, expected, delta=timedelta(seconds=1))
+
+    def test_querysets_split_on_expiry(self):
+        self.assertEqual(list(Subscribe.objects.active()), [self.active])
+        self.assertEqual(list(Subscribe.objects.expired()), [self.lapsed])
+
+    def test_sweep_uncounts_each_expiry_once(self):
+        self.assertEqual(self.subscribers(self.other), 1)
+
+        self.assertEqual(sweep_expired_subscriptions(), 1)
+        self.assertEqual(sweep_expired_subscriptions(), 0)
+        self.assertEqual(self.subscribers(self.other), 0)
+        self.assertEqual(self.subscribers(self.author), 1)
+        self.assertTrue(Subscribe.objects.get(pk=self.lapsed.pk).expiry_processed)
+
+    def test_deleting_a_swept_subscription_keeps_the_count(self):
+        sweep_expired_subscriptions()
+        Subscribe.objects.create(author=self.other, subscriber=self.author, duration=1)
+        self.assertEqual(self.subscribers(self.other), 1)
+
+        Subscribe.objects.get(pk=self.lapsed.pk).delete()
+        self.assertEqual(self.subscribers(self.other), 1)
+
+    def test_sweep_command_works_in_batches(self):
+        third = make_user(3)
+        expire(Subscribe.objects.create(author=third, subscriber=self.reader, duration=1))
+
+        out = StringIO()
+        call_command('sweep_expired_subscriptions', '--batch-size', '1', stdout=out)
+        self.assertIn('2 expired subscriptions swept', out.getvalue())
+        self.assertFalse(Subscribe.objects.pending_expiry().exists())
+
+    def test_admin_status_filter(self):
+        request = RequestFactory().get('/', {'status': 'expired'})
+        admin = SubscribeAdmin(Subscribe, AdminSite())
+        status_filter = SubscriptionStatusFilter(request, {'status': ['expired']}, Subscribe, admin)
+        self.assertEqual(list(status_filter.queryset(request, Subscribe.objects.all())), [self.lapsed])
+
+
+class SubscriptionRenewalTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reader = make_user(0)
+        self.author = make_user(1)
+        self.subscription = Subscribe.objects.create(author=self.author, subscriber=self.reader, duration=1)
+        self.client.force_authenticate(user=self.reader)
+
+    def test_renewal_moves_expiry_and_counts_again(self):
+        expire(self.subscription)
+        sweep_expired_subscriptions()
+
+        response = self.client.patch(reverse('relationships:subscribe_update-detail', args=[self.subscription.pk]),
+                                     {'duration': 6})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_active'])
+
+        self.subscription.refresh_from_db()
+        self.assertGreater(self.subscription.expires_at, timezone.now() + relativedelta(months=5))
+        self.assertFalse(self.subscription.expiry_processed)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.subscribers_count, 1)
@@ -1,7 +1,12 @@
+from django.db import IntegrityError, transaction
+from rest_framework.decorators import action
 from rest_framework.generics import ListCreateAPIView, DestroyAPIView, UpdateAPIView
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from accounts.models import User
 from .models import Follow, Subscribe
-from .serializers import FollowSerializer, SubscribeUpdateSerializer ,SubscribeCreateSerializer
+from .serializers import FollowSerializer, FollowBulkSerializer, SubscribeUpdateSerializer ,SubscribeCreateSerializer
+from .signals import follows_bulk_created
 from rest_framework.permissions import IsAuthenticated
 
 
@@ -13,6 +18,88 @@ class FollowView(ListCreateAPIView, DestroyAPIView, GenericViewSet):
     def get_queryset(self):
         return Follow.objects.filter(follower=self.request.user)
 
+    @action(detail=False, methods=['post', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Follow (POST) or unfollow (DELETE) every username in `usernames`. The
+        authors and the existing follows are resolved with one query each;
+        the result holds one status per username, in the order sent.
+        """
+        serializer = FollowBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        usernames = list(dict.fromkeys(serializer.validated_data['usernames']))
+
+        authors = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        followed = set(
+            Follow.objects.filter(follower=request.user, author_id__in=authors.values()).values_list('author_id', flat=True)
+        )
+        if request.method == 'DELETE':
+            results = self.bulk_unfollow(usernames, authors, followed)
+        else:
+            results = self.bulk_follow(usernames, authors, followed)
+        return Response({'results': results})
+
+    def bulk_follow(self, usernames, authors, followed):
+        candidates = [
+            author_id for author_id in dict.fromkeys(authors.get(username) for username in usernames)
+            if author_id is not None and author_id != self.request.user.pk and author_id not in followed
+        ]
+        inserted = self.insert_follows(candidates)
+
+        results = []
+        for username in usernames:
+            author_id = authors.get(username)
+            if author_id is None:
+                result = 'not_found'
+            elif author_id == self.request.user.pk:
+                result = 'self'
+            elif author_id in inserted:
+                result = 'followed'
+            else:
+                result = 'already_following'
+            results.append({'username': username, 'status': result})
+        return results
+
+    def insert_follows(self, author_ids):
+        """
+        Insert follows of `author_ids` and return the ids actually followed by
+        this request. Authors a concurrent request followed meanwhile (it already
+        counted them through post_save) are dropped and the insert is retried.
+        """
+        follower = self.request.user
+        while author_ids:
+            try:
+                with transaction.atomic():
+                    Follow.objects.bulk_create([Follow(author_id=author_id, follower=follower) for author_id in author_ids])
+                    follows_bulk_created.send(sender=Follow, follower_id=follower.pk, author_ids=author_ids)
+                return set(author_ids)
+            except IntegrityError:
+                taken = set(
+                    Follow.objects.filter(follower=follower, author_id__in=author_ids).values_list('author_id', flat=True)
+                )
+                if not taken:
+                    raise
+                author_ids = [author_id for author_id in author_ids if author_id not in taken]
+        return set()
+
+    def bulk_unfollow(self, usernames, authors, followed):
+        results = []
+        for username in usernames:
+            author_id = authors.get(username)
+            if author_id is None:
+                result = 'not_found'
+            elif author_id in followed:
+                result = 'unfollowed'
+            else:
+                result = 'not_following'
+            results.append({'username': username, 'status': result})
+
+        if followed:
+            # A queryset delete still sends post_delete per row, which keeps
+            # counters, cards and timelines in step.
+            self.get_queryset().filter(author_id__in=followed).delete()
+        return results
+
 
 class SubscribeListCreateView(ListCreateAPIView, GenericViewSet):
     serializer_class = SubscribeCreateSerializer
@@ -29,4 +116,4 @@ class SubscribeUpdateView(UpdateAPIView, GenericViewSet):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return Subscribe.objects.filter(subscriber=self.request.user)
\ No newline at end of file
+        return Subscribe.objects.filter(subscriber=self.request.user)
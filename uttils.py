@@ -1,15 +1,6 @@
-from kavenegar import *
+from accounts.sms import enqueue_sms
 
 
 def send_otp_code(phone_number, code):
-    try:
-        api = KavenegarAPI()
-        params = { 'sender' : '',
-                   'receptor': phone_number,
-                   'message' :f'BLOGSPACE: your verification code {code}, edpired in 3 minutes' }
-        response = api.sms_send(params)
-        print(response)
-    except APIException as err:
-        print(err)
-    except HTTPException as err:
-        print(err)
\ No newline at end of file
+    """Queue the verification code; the `send_sms` worker delivers it."""
+    enqueue_sms(phone_number, f'BLOGSPACE: your verification code {code}, expires in 3 minutes')